@@ -1,61 +1,198 @@
 import asyncio
+import json
+from typing import List, Optional
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from app.services.vision import extract_bets_from_image
-from app.services.analyzer import analyze_single_bet
-from app.schemas import ParlayResponse
+from app.config import settings
+from app.services.analyzer import analyze_single_bet, analyze_bets_deduped, leg_key
+from app.services.http_pool import get_pool_stats
+from app.services.metrics import run_in_context
+from app.services.result_cache import RESULT_CACHE
+from app.services.feature_store import FEATURE_STORE
+from app.services.parlay_engine import simulate_parlays
+from app.schemas import ParlayResponse, BetAnalysis, ExtractedBet, BatchAnalyzeRequest, BatchAnalyzeResponse
 
 router = APIRouter()
 
-@router.post("/analyze-slip", response_model=ParlayResponse)
-async def analyze_slip(file: UploadFile = File(...)):
+def _score_probability(score: int) -> float:
+    # Map Score 0-100 to Win Prob 0.35 - 0.75 (Realistic individual prop range)
+    return 0.35 + ((score / 100) * 0.40)
+
+def simulation_legs(analyzed_bets: List[BetAnalysis], bets: List[ExtractedBet]) -> List[dict]:
+    """Monte Carlo inputs: each leg's game log plus who/which team it depends on."""
+    return [
+        {
+            # Synthetic logs are centered on the line by construction, the score carries more signal
+            "values": [] if b.is_simulated else b.last_10_graph.values,
+            "line": bet.line,
+            "operator": bet.operator,
+            "prop": bet.prop_type.lower().strip(),
+            "players": [p.strip().lower() for p in b.player_name.split("+") if p.strip()],
+            "team": b.team_id,
+            "probability": _score_probability(b.confidence_score),
+            "injury_status": b.advanced_stats.injury_status,
+        }
+        for b, bet in zip(analyzed_bets, bets)
+    ]
+
+def summarize_parlay(analyzed_bets: List[BetAnalysis], simulation: Optional[dict] = None) -> dict:
+    # 1. Overall Parlay Score
+    total_score = sum(b.confidence_score for b in analyzed_bets)
+    avg_score = total_score // len(analyzed_bets) if analyzed_bets else 0
+    
+    # 2. Weakest Leg (Min Score)
+    weakest_bet = min(analyzed_bets, key=lambda x: x.confidence_score)
+    weakest_str = f"{weakest_bet.player_name}: {weakest_bet.prop_description}"
+    
+    # 3. Win Reality Probability
+    # Client Scale: 40%+ Stable, 25-39 Balanced, 15-24 Fragile, <15 Longshot
+    # Simulated (correlated legs) when available, else the independent product of score odds
+    leg_risk = []
+    if simulation:
+        parlay_prob_decimal = simulation["win_probability"]
+        leg_risk = [round(leg["miss_share"], 3) for leg in simulation["legs"]]
+    else:
+        parlay_prob_decimal = 1.0
+        for b in analyzed_bets:
+            parlay_prob_decimal *= _score_probability(b.confidence_score)
+        
+    win_pct_val = int(parlay_prob_decimal * 100)
+    
+    if win_pct_val >= 40: win_label = "Stable"
+    elif win_pct_val >= 25: win_label = "Balanced"
+    elif win_pct_val >= 15: win_label = "Fragile"
+    else: win_label = "Longshot"
+    
+    return {
+        "overall_parlay_score": avg_score,
+        "win_probability": f"{win_pct_val}%",
+        "win_label": win_label,
+        "weakest_leg": weakest_str,
+        "leg_risk": leg_risk,
+    }
+
+async def simulate_slips(slips: List[tuple]) -> List[Optional[dict]]:
+    """Runs the batched simulation off the event loop; falls back to None (score odds) on failure."""
+    try:
+        legs = [simulation_legs(analyzed, bets) for analyzed, bets in slips]
+        return await asyncio.get_event_loop().run_in_executor(None, run_in_context(simulate_parlays, legs))
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        return [None] * len(slips)
+
+async def _read_slip_bets(file: UploadFile) -> list:
     if not file.content_type.startswith("image/"):
         raise HTTPException(400, "File must be an image")
     
     image_bytes = await file.read()
+    extracted_bets = await extract_bets_from_image(image_bytes)
     
+    if not extracted_bets:
+        raise HTTPException(400, "Could not detect any bets.")
+    return extracted_bets
+
+@router.post("/analyze-slip", response_model=ParlayResponse)
+async def analyze_slip(file: UploadFile = File(...)):
     try:
-        extracted_bets = await extract_bets_from_image(image_bytes)
-        
-        if not extracted_bets:
-            raise HTTPException(400, "Could not detect any bets.")
+        extracted_bets = await _read_slip_bets(file)
 
         # Parallel Analysis
         analysis_tasks = [analyze_single_bet(bet) for bet in extracted_bets]
         analyzed_bets = await asyncio.gather(*analysis_tasks)
         
-        # 1. Overall Parlay Score
-        total_score = sum(b.confidence_score for b in analyzed_bets)
-        avg_score = total_score // len(analyzed_bets) if analyzed_bets else 0
-        
-        # 2. Weakest Leg (Min Score)
-        weakest_bet = min(analyzed_bets, key=lambda x: x.confidence_score)
-        weakest_str = f"{weakest_bet.player_name}: {weakest_bet.prop_description}"
-        
-        # 3. Win Reality Probability
-        # Client Scale: 40%+ Stable, 25-39 Balanced, 15-24 Fragile, <15 Longshot
-        parlay_prob_decimal = 1.0
-        
-        for b in analyzed_bets:
-            # Map Score 0-100 to Win Prob 0.35 - 0.75 (Realistic individual prop range)
-            prob = 0.35 + ((b.confidence_score / 100) * 0.40)
-            parlay_prob_decimal *= prob
-            
-        win_pct_val = int(parlay_prob_decimal * 100)
-        
-        if win_pct_val >= 40: win_label = "Stable"
-        elif win_pct_val >= 25: win_label = "Balanced"
-        elif win_pct_val >= 15: win_label = "Fragile"
-        else: win_label = "Longshot"
-        
-        return ParlayResponse(
-            overall_parlay_score=avg_score,
-            win_probability=f"{win_pct_val}%",
-            win_label=win_label,
-            weakest_leg=weakest_str,
-            bets=analyzed_bets
+        [simulation] = await simulate_slips([(analyzed_bets, extracted_bets)])
+        return ParlayResponse(**summarize_parlay(analyzed_bets, simulation), bets=analyzed_bets)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(500, f"Server Error: {str(e)}")
+
+def _ndjson(payload: dict) -> str:
+    return json.dumps(jsonable_encoder(payload)) + "\n"
+
+@router.post("/analyze-slip/stream")
+async def analyze_slip_stream(file: UploadFile = File(...)):
+    """
+    NDJSON stream: one "bets" line right after vision, one "leg" line per
+    BetAnalysis in completion order, then a final "summary" line.
+    """
+    extracted_bets = await _read_slip_bets(file)
+
+    async def analyze_indexed(i, bet):
+        return i, await analyze_single_bet(bet)
+
+    async def stream():
+        yield _ndjson({"type": "bets", "bets": extracted_bets})
+        tasks = [asyncio.ensure_future(analyze_indexed(i, bet)) for i, bet in enumerate(extracted_bets)]
+        analyzed_bets = [None] * len(tasks)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                i, analysis = await next_done
+                analyzed_bets[i] = analysis
+                yield _ndjson({"type": "leg", "index": i, "bet": analysis})
+            [simulation] = await simulate_slips([(analyzed_bets, extracted_bets)])
+            yield _ndjson({"type": "summary", **summarize_parlay(analyzed_bets, simulation)})
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            yield _ndjson({"type": "error", "detail": f"Server Error: {str(e)}"})
+        finally:
+            # Client went away or a leg failed: stop the remaining work
+            for t in tasks: t.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/analyze-batch", response_model=BatchAnalyzeResponse)
+async def analyze_batch(request: BatchAnalyzeRequest):
+    """Scores structured slips without vision; identical legs are analyzed once per batch."""
+    if not request.slips:
+        raise HTTPException(400, "No slips provided.")
+    if len(request.slips) > settings.BATCH_MAX_SLIPS:
+        raise HTTPException(400, f"At most {settings.BATCH_MAX_SLIPS} slips per batch.")
+    if any(not slip.bets for slip in request.slips):
+        raise HTTPException(400, "Every slip needs at least one bet.")
+
+    try:
+        all_bets = [bet for slip in request.slips for bet in slip.bets]
+        analyzed = await analyze_bets_deduped(all_bets)
+
+        per_slip, offset = [], 0
+        for slip in request.slips:
+            per_slip.append((analyzed[offset:offset + len(slip.bets)], slip.bets))
+            offset += len(slip.bets)
+
+        # One simulation call for every slip in the batch
+        simulations = await simulate_slips(per_slip)
+        results = [
+            ParlayResponse(**summarize_parlay(slip_bets, simulation), bets=slip_bets)
+            for (slip_bets, _), simulation in zip(per_slip, simulations)
+        ]
+
+        return BatchAnalyzeResponse(
+            total_legs=len(all_bets),
+            unique_legs=len({leg_key(bet) for bet in all_bets}),
+            results=results
         )
 
     except Exception as e:
         import traceback
         traceback.print_exc()
-        raise HTTPException(500, f"Server Error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(500, f"Server Error: {str(e)}")
+
+@router.get("/stats/http-pool")
+async def http_pool_stats():
+    return get_pool_stats()
+
+@router.get("/stats/result-cache")
+async def result_cache_stats():
+    return RESULT_CACHE.stats()
+
+@router.get("/stats/feature-store")
+async def feature_store_stats():
+    return FEATURE_STORE.stats()
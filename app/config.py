@@ -8,4 +8,73 @@ class Settings:
     SGO_API_KEY = os.getenv("SPORTSGAMEODDS_API_KEY")
     SGO_BASE_URL = "https://api.sportsgameodds.com/v2"
 
+    # Shared SGO connection pool
+    SGO_TIMEOUT = float(os.getenv("SGO_TIMEOUT", "25"))
+    SGO_MAX_CONNECTIONS = int(os.getenv("SGO_MAX_CONNECTIONS", "20"))
+    SGO_MAX_KEEPALIVE = int(os.getenv("SGO_MAX_KEEPALIVE", "10"))
+    SGO_KEEPALIVE_EXPIRY = float(os.getenv("SGO_KEEPALIVE_EXPIRY", "30"))
+    SGO_HTTP2 = os.getenv("SGO_HTTP2", "true").lower() == "true"
+    SGO_EVENTS_TTL = int(os.getenv("SGO_EVENTS_TTL", "900"))
+    SCHEDULE_REFRESH_SECONDS = int(os.getenv("SCHEDULE_REFRESH_SECONDS", "600"))
+    INJURY_REFRESH_SECONDS = int(os.getenv("INJURY_REFRESH_SECONDS", "3600"))
+    # SGO /players re-page interval for loaded leagues
+    PLAYER_REFRESH_SECONDS = int(os.getenv("PLAYER_REFRESH_SECONDS", "21600"))
+
+    # Blocking stats sources (nba_api, NFL pandas lookups)
+    STATS_WORKERS = int(os.getenv("STATS_WORKERS", "4"))
+    NBA_LOG_TTL = int(os.getenv("NBA_LOG_TTL", "1800"))
+    NBA_LOG_CACHE_SIZE = int(os.getenv("NBA_LOG_CACHE_SIZE", "2000"))
+    NBA_ROSTER_REFRESH_SECONDS = int(os.getenv("NBA_ROSTER_REFRESH_SECONDS", "21600"))
+
+    # Slip screenshots are shrunk to what GPT-4o's high-detail mode actually reads
+    VISION_MAX_LONG_SIDE = int(os.getenv("VISION_MAX_LONG_SIDE", "2048"))
+    VISION_MAX_SHORT_SIDE = int(os.getenv("VISION_MAX_SHORT_SIDE", "768"))
+    VISION_LOW_DETAIL_MAX = int(os.getenv("VISION_LOW_DETAIL_MAX", "512"))
+    VISION_JPEG_QUALITY = int(os.getenv("VISION_JPEG_QUALITY", "85"))
+
+    # Batch JSON analysis
+    BATCH_MAX_SLIPS = int(os.getenv("BATCH_MAX_SLIPS", "1000"))
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+
+    # Memoized analyze_single_bet results; data refreshes (team events, rosters, NBA/NFL feeds) invalidate them
+    RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "10000"))
+    RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "300"))
+
+    # Rolling per player/prop features (keyed by game-log window, so TTL only bounds idle entries)
+    FEATURE_STORE_SIZE = int(os.getenv("FEATURE_STORE_SIZE", "20000"))
+    FEATURE_STORE_TTL = int(os.getenv("FEATURE_STORE_TTL", "86400"))
+
+    # Warm data shared across uvicorn workers: "" (in-process), "sqlite", "sqlite:///file" or "redis://..."
+    SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL", "")
+    SHARED_CACHE_TTL = int(os.getenv("SHARED_CACHE_TTL", "86400"))
+    SHARED_CACHE_LEASE_SECONDS = float(os.getenv("SHARED_CACHE_LEASE_SECONDS", "300"))
+    SHARED_CACHE_POLL_SECONDS = float(os.getenv("SHARED_CACHE_POLL_SECONDS", "0.5"))
+
+    # Local on-disk state (search results, snapshots)
+    DATA_DIR = os.getenv("DATA_DIR", "data")
+    SNAPSHOT_MAX_AGE = int(os.getenv("SNAPSHOT_MAX_AGE", "604800"))
+
+    # Web search + LLM fallback
+    WEB_SEARCH_WORKERS = int(os.getenv("WEB_SEARCH_WORKERS", "4"))
+    WEB_SEARCH_TIMEOUT = float(os.getenv("WEB_SEARCH_TIMEOUT", "8"))
+    WEB_SEARCH_LLM_TIMEOUT = float(os.getenv("WEB_SEARCH_LLM_TIMEOUT", "20"))
+    WEB_SEARCH_TTL = int(os.getenv("WEB_SEARCH_TTL", "43200"))
+
+    # Parlay Monte Carlo: simulated outcomes per slip
+    PARLAY_SIM_SAMPLES = int(os.getenv("PARLAY_SIM_SAMPLES", "100000"))
+
+    # Per-upstream bulkheads: requests/sec, burst, max in flight (and worker threads for blocking clients)
+    SGO_RATE = float(os.getenv("SGO_RATE", "10"))
+    SGO_BURST = int(os.getenv("SGO_BURST", "10"))
+    SGO_MAX_IN_FLIGHT = int(os.getenv("SGO_MAX_IN_FLIGHT", "8"))
+    NBA_API_RATE = float(os.getenv("NBA_API_RATE", "2"))
+    NBA_API_BURST = int(os.getenv("NBA_API_BURST", "2"))
+    NBA_API_MAX_IN_FLIGHT = int(os.getenv("NBA_API_MAX_IN_FLIGHT", "2"))
+    OPENAI_RATE = float(os.getenv("OPENAI_RATE", "5"))
+    OPENAI_BURST = int(os.getenv("OPENAI_BURST", "5"))
+    OPENAI_MAX_IN_FLIGHT = int(os.getenv("OPENAI_MAX_IN_FLIGHT", "8"))
+    WEB_SEARCH_RATE = float(os.getenv("WEB_SEARCH_RATE", "1"))
+    WEB_SEARCH_BURST = int(os.getenv("WEB_SEARCH_BURST", "2"))
+    WEB_SEARCH_MAX_IN_FLIGHT = int(os.getenv("WEB_SEARCH_MAX_IN_FLIGHT", "2"))
+
 settings = Settings()
\ No newline at end of file
@@ -1,32 +1,91 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 import asyncio
+import time
+import httpx
 from app.api.routes import router
-from app.services.nfl_service import preload_nfl_data
-from app.services.sgo_client import fetch_all_players_once
+from app.services.nfl_service import preload_nfl_data, injury_refresh_loop
+from app.services.sgo_client import fetch_all_players_once, player_refresh_loop, LEAGUE_MAP
+from app.services.schedule_service import schedule_refresh_loop
+from app.services.nba_service import roster_refresh_loop
+from app.services.rank_service import rank_refresh_loop
+from app.services.snapshot import load_snapshot, save_snapshot, revalidate_warm_state
+from app.services.readiness import get_readiness
+from app.services.http_pool import start_sgo_client, close_sgo_client
+from app.services.metrics import (
+    REQUEST_SECONDS, start_request_timings, finish_request_timings, server_timing_header, render_prometheus
+)
+
+async def warm_start(client: httpx.AsyncClient):
+    loop = asyncio.get_event_loop()
+    
+    # 0. Restore the last on-disk snapshot so a restart is warm in seconds
+    restored = await loop.run_in_executor(None, load_snapshot)
+    
+    # 1. NFL download (thread) and every league's SGO roster run side by side on a cold start
+    # (restored leagues return immediately; the SGO bulkhead paces the paging)
+    steps = [fetch_all_players_once(client, lg) for lg in sorted(set(LEAGUE_MAP.values()))]
+    if not restored["nfl"]:
+        print("Downloading NFL/NBA datasets...")
+        steps.append(loop.run_in_executor(None, preload_nfl_data))
+    await asyncio.gather(*steps, return_exceptions=True)
+    print("READY: System is hot and cached!")
+    
+    # 2. Revalidate restored data in the background and write a fresh snapshot
+    await revalidate_warm_state(client, restored)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Downloading NFL/NBA datasets...")
-    
-    # 1. Run blocking NFL download in a thread
     loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, preload_nfl_data)
+    client = start_sgo_client()
     
-    # 2. Prefetch SGO NBA Players
-    # Create a dummy client just to fill the cache
-    import httpx
-    async with httpx.AsyncClient() as client:
-        await fetch_all_players_once(client, "NBA")
+    # Serve immediately: warm-up and refresh loops all run in the background,
+    # requests that arrive before their data is loaded use the fallbacks
+    tasks = [
+        asyncio.create_task(warm_start(client)),
+        asyncio.create_task(schedule_refresh_loop(client, sorted(set(LEAGUE_MAP.values())))),
+        asyncio.create_task(injury_refresh_loop()),
+        asyncio.create_task(roster_refresh_loop()),
+        asyncio.create_task(player_refresh_loop(client)),
+        asyncio.create_task(rank_refresh_loop()),
+    ]
     
-    print("READY: System is hot and cached!")
     yield
     print("Shutting down...")
+    for task in tasks:
+        task.cancel()
+    await loop.run_in_executor(None, save_snapshot)
+    await close_sgo_client()
 
 app = FastAPI(title="ParlAi Engine", version="1.0.0", lifespan=lifespan)
 
 app.include_router(router, prefix="/api/v1")
 
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    token = start_request_timings()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        timings = finish_request_timings(token)
+    elapsed = time.perf_counter() - start
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(elapsed, path=getattr(route, "path", "unmatched"))
+    header = server_timing_header(timings)
+    response.headers["Server-Timing"] = f'{header + ", " if header else ""}total;dur={elapsed * 1000:.1f}'
+    return response
+
 @app.get("/")
 def health_check():
-    return {"status": "Active"}
\ No newline at end of file
+    return {"status": "Active"}
+
+@app.get("/ready")
+def readiness_check():
+    report = get_readiness()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
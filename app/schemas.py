@@ -47,6 +47,8 @@ class MarketInsights(BaseModel):
 class BetAnalysis(BaseModel):
     sport: str
     player_name: str
+    team_id: Optional[str] = None   # SGO teamID of the first player, used for leg correlation
+    is_simulated: bool = False      # last_10_graph is synthetic (built around the line), not real games
     prop_description: str
     confidence_score: int
     risk_level: str
@@ -64,5 +66,17 @@ class ParlayResponse(BaseModel):
     win_probability: str        # "23%"
     win_label: str              # "Fragile", "Stable"
     weakest_leg: str            # "Ja Morant: Over 20.5"
+    leg_risk: List[float] = []  # Share of simulated losing slips in which each leg missed
     
-    bets: List[BetAnalysis]
\ No newline at end of file
+    bets: List[BetAnalysis]
+
+class BatchSlip(BaseModel):
+    bets: List[ExtractedBet]
+
+class BatchAnalyzeRequest(BaseModel):
+    slips: List[BatchSlip]
+
+class BatchAnalyzeResponse(BaseModel):
+    total_legs: int
+    unique_legs: int
+    results: List[ParlayResponse]
\ No newline at end of file
@@ -1,9 +1,57 @@
+import asyncio
+from typing import List
+from app.config import settings
 from app.schemas import ExtractedBet, BetAnalysis, AdvancedStats, GraphData, MarketInsights
 from app.services.sgo_client import get_player_data
+from app.services.result_cache import RESULT_CACHE
+from app.services.metrics import timed, record_cache, register_gauge
 
+register_gauge("parlai_result_cache_entries", "Memoized bet analyses currently held.", lambda: {(): float(RESULT_CACHE.stats()["size"])})
+
+@timed("analysis.bet")
 async def analyze_single_bet(bet: ExtractedBet) -> BetAnalysis:
+    key = result_key(bet)
+    cached = RESULT_CACHE.get(key)
+    record_cache("bet_result", cached is not None)
+    if cached is not None: return cached
+    
     data = await get_player_data(bet.player_name, bet.sport, bet.line, bet.prop_type)
+    analysis = build_bet_analysis(bet, data)
+    RESULT_CACHE.set(key, analysis)
+    return analysis
+
+def leg_key(bet: ExtractedBet) -> tuple:
+    """Legs with the same key share one get_player_data result (operator only affects scoring)."""
+    return (" ".join(bet.player_name.lower().split()), bet.sport.lower().strip(), bet.prop_type.lower().strip(), float(bet.line))
+
+def result_key(bet: ExtractedBet) -> tuple:
+    return leg_key(bet) + (bet.operator,)
+
+async def analyze_bets_deduped(bets: List[ExtractedBet]) -> List[BetAnalysis]:
+    """Fetches data once per unique leg across the whole batch, then scores every leg."""
+    cached = [RESULT_CACHE.get(result_key(bet)) for bet in bets]
+    unique = {}
+    for bet, hit in zip(bets, cached):
+        if hit is None: unique.setdefault(leg_key(bet), bet)
+    
+    limiter = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+    async def fetch(bet):
+        async with limiter:
+            return await get_player_data(bet.player_name, bet.sport, bet.line, bet.prop_type)
     
+    keys = list(unique)
+    results = await asyncio.gather(*(fetch(unique[k]) for k in keys))
+    data_by_key = dict(zip(keys, results))
+    
+    analyzed = []
+    for bet, hit in zip(bets, cached):
+        if hit is None:
+            hit = build_bet_analysis(bet, data_by_key[leg_key(bet)])
+            RESULT_CACHE.set(result_key(bet), hit)
+        analyzed.append(hit)
+    return analyzed
+
+def build_bet_analysis(bet: ExtractedBet, data: dict) -> BetAnalysis:
     if not data.get('found'):
         return BetAnalysis(
             sport=bet.sport,
@@ -32,7 +80,7 @@ async def analyze_single_bet(bet: ExtractedBet) -> BetAnalysis:
     market_raw = data['market']
     
     score = 70 
-    last_5_avg = sum(logs[-5:]) / 5 if logs else 0
+    last_5_avg = data['last_5_avg'] if 'last_5_avg' in data else (sum(logs[-5:]) / 5 if logs else 0)
     
     # 1. Performance
     if bet.operator == "Over":
@@ -103,6 +151,8 @@ async def analyze_single_bet(bet: ExtractedBet) -> BetAnalysis:
     return BetAnalysis(
         sport=bet.sport,
         player_name=data['name'],
+        team_id=data.get('team_id'),
+        is_simulated=data.get('is_simulated', False),
         prop_description=f"{bet.prop_type} {bet.operator} {bet.line}",
         confidence_score=score,
         risk_level=risk,
@@ -0,0 +1,121 @@
+import math
+from array import array
+from datetime import datetime
+from typing import Hashable, Optional, Sequence
+from app.config import settings
+from app.services.metrics import record_cache
+from app.services.result_cache import TTLCache
+
+# Per player/prop rolling features (averages, usage trend, home/away split, minutes, last
+# game date), derived once per game-log window and reused until the window changes.
+
+DATE_FORMATS = ["%b %d, %Y", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]
+
+def parse_minutes(m) -> float:
+    """ "34:12" or 34.2 -> 34.2; unparseable or non-positive -> NaN."""
+    try:
+        if isinstance(m, str) and ":" in m:
+            parts = m.split(":")
+            val = float(parts[0]) + float(parts[1])/60
+        else: val = float(m)
+    except: return math.nan
+    return val if val > 0 else math.nan
+
+def parse_game_date(value) -> Optional[datetime]:
+    text = str(value)
+    for fmt in DATE_FORMATS:
+        try: return datetime.strptime(text, fmt)
+        except: pass
+    return None
+
+def _is_home(venue) -> int:
+    loc = str(venue).lower()
+    return 1 if "vs" in loc or "home" in loc else 0
+
+class PlayerFeatures:
+    """One game-log window in compact arrays plus its sums."""
+    __slots__ = ("values", "minutes", "home", "last_date",
+                 "total", "home_sum", "home_n", "away_sum", "away_n", "fingerprint")
+
+    def __init__(self, logs: Sequence[float], minutes: Sequence, dates: Sequence, venues: Sequence, fingerprint: int):
+        self.values = array("d", logs)
+        self.minutes = array("d", (parse_minutes(m) for m in minutes))
+        self.home = array("b", (_is_home(v) for v in venues)) if venues and len(venues) == len(logs) else array("b")
+        self.last_date = parse_game_date(dates[-1]) if dates else None
+        self.fingerprint = fingerprint
+        self._resum()
+
+    def _resum(self):
+        self.total = sum(self.values)
+        self.home_sum = self.away_sum = 0.0
+        self.home_n = self.away_n = 0
+        for v, h in zip(self.values, self.home):
+            if h: self.home_sum += v; self.home_n += 1
+            else: self.away_sum += v; self.away_n += 1
+
+    @property
+    def season_avg(self) -> float:
+        return round(self.total / len(self.values), 1) if self.values else 0.0
+
+    @property
+    def last_5_avg(self) -> float:
+        return sum(self.values[-5:]) / 5 if self.values else 0
+
+    @property
+    def usage_trend(self) -> str:
+        if len(self.values) >= 5:
+            if self.last_5_avg > self.season_avg * 1.1: return "Usage up 10%"
+            if self.last_5_avg < self.season_avg * 0.9: return "Usage down 10%"
+        return "Stable"
+
+    @property
+    def minutes_str(self) -> str:
+        recent = []
+        for m in reversed(self.minutes):
+            if not math.isnan(m): recent.append(m)
+            if len(recent) == 5: break
+        if not recent: return "N/A"
+        recent.reverse()  # Oldest first, same summation order as the raw list
+        return f"{round(sum(recent) / len(recent), 1)} min avg"
+
+    @property
+    def split_str(self) -> str:
+        if not (self.home_n and self.away_n): return "0.0 (Neutral)"
+        diff = round(self.home_sum / self.home_n - self.away_sum / self.away_n, 1)
+        return f"{'+' if diff > 0 else ''}{diff} (Home vs Away)"
+
+    def rest_str(self, now: Optional[datetime] = None) -> str:
+        # Derived at read time: the rest count moves with the clock, not with new games
+        if self.last_date is None: return "1 day rest"
+        diff = ((now or datetime.now()) - self.last_date).days
+        return "2 days rest" if diff > 20 else f"{diff} days rest"
+
+    def advanced(self) -> dict:
+        return {"minutes": self.minutes_str, "rest": self.rest_str(), "split": self.split_str}
+
+def _fingerprint(logs, minutes, dates, venues) -> int:
+    return hash((tuple(logs), tuple(minutes), tuple(str(d) for d in dates), tuple(str(v) for v in venues)))
+
+class FeatureStore:
+    """(sport, player, prop) -> PlayerFeatures; a window is only rebuilt when its game log changes."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize, ttl)
+        self.rebuilds = 0
+
+    def ingest(self, key: Hashable, logs: Sequence[float], minutes: Sequence = (), dates: Sequence = (), venues: Sequence = ()) -> PlayerFeatures:
+        fingerprint = _fingerprint(logs, minutes, dates, venues)
+        entry = self._entries.get(key)
+        record_cache("feature_store", entry is not None and entry.fingerprint == fingerprint)
+        if entry is not None and entry.fingerprint == fingerprint: return entry
+
+        # A fresh build beats sliding the old window: logs are short and the overlap check costs more
+        entry = PlayerFeatures(logs, minutes, dates, venues, fingerprint)
+        self.rebuilds += 1
+        self._entries.set(key, entry)
+        return entry
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "rebuilds": self.rebuilds}
+
+FEATURE_STORE = FeatureStore(settings.FEATURE_STORE_SIZE, settings.FEATURE_STORE_TTL)
@@ -0,0 +1,95 @@
+import httpx
+from typing import Optional
+from app.config import settings
+from app.services.metrics import register_gauge, span
+from app.services.upstream import SGO
+
+# One keep-alive pool for every SportsGameOdds call in the process
+SGO_CLIENT: Optional[httpx.AsyncClient] = None
+POOL_STATS = {"requests": 0, "responses": 0}
+
+def _http2_available() -> bool:
+    if not settings.SGO_HTTP2: return False
+    try:
+        import h2  # noqa: F401  (httpx needs the h2 extra for HTTP/2)
+        return True
+    except ImportError:
+        print("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1.")
+        return False
+
+async def _on_request(request: httpx.Request):
+    POOL_STATS["requests"] += 1
+
+async def _on_response(response: httpx.Response):
+    POOL_STATS["responses"] += 1
+
+def start_sgo_client() -> httpx.AsyncClient:
+    global SGO_CLIENT
+    if SGO_CLIENT is None or SGO_CLIENT.is_closed:
+        SGO_CLIENT = httpx.AsyncClient(
+            headers={"X-API-Key": settings.SGO_API_KEY or ""},
+            timeout=settings.SGO_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.SGO_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SGO_MAX_KEEPALIVE,
+                keepalive_expiry=settings.SGO_KEEPALIVE_EXPIRY,
+            ),
+            http2=_http2_available(),
+            event_hooks={"request": [_on_request], "response": [_on_response]},
+        )
+    return SGO_CLIENT
+
+def get_sgo_client() -> httpx.AsyncClient:
+    """Returns the shared client, opening it lazily outside the app lifespan."""
+    return start_sgo_client()
+
+async def close_sgo_client():
+    global SGO_CLIENT
+    if SGO_CLIENT is not None:
+        await SGO_CLIENT.aclose()
+        SGO_CLIENT = None
+
+async def sgo_get(client: httpx.AsyncClient, path: str, params: dict, stage: str) -> httpx.Response:
+    """GET against SGO inside its bulkhead; 429s and timeouts slow every SGO caller down."""
+    async with SGO.slot():
+        try:
+            with span(stage):
+                res = await client.get(f"{settings.SGO_BASE_URL}{path}", params=params)
+        except httpx.TimeoutException:
+            SGO.report(throttled=True)
+            raise
+    SGO.report(throttled=res.status_code == 429)
+    return res
+
+def get_pool_stats() -> dict:
+    stats = {
+        "open": SGO_CLIENT is not None and not SGO_CLIENT.is_closed,
+        "http2": False,
+        "max_connections": settings.SGO_MAX_CONNECTIONS,
+        "max_keepalive": settings.SGO_MAX_KEEPALIVE,
+        "connections": 0,
+        "active": 0,
+        "idle": 0,
+        "queued": 0,
+        "requests_total": POOL_STATS["requests"],
+        "responses_total": POOL_STATS["responses"],
+    }
+    if not stats["open"]: return stats
+    # httpx does not publish pool internals, so read the httpcore pool defensively
+    try:
+        pool = SGO_CLIENT._transport._pool
+        stats["http2"] = bool(getattr(pool, "_http2", False))
+        conns = list(pool.connections)
+        stats["connections"] = len(conns)
+        stats["idle"] = sum(1 for c in conns if c.is_idle())
+        stats["active"] = stats["connections"] - stats["idle"]
+        stats["queued"] = max(0, len(getattr(pool, "_requests", [])) - stats["active"])
+    except Exception:
+        pass
+    stats["utilization"] = round(stats["active"] / stats["max_connections"], 3) if stats["max_connections"] else 0.0
+    return stats
+
+register_gauge(
+    "parlai_sgo_pool_connections", "SportsGameOdds pool connections by state.",
+    lambda: {(("state", k),): float(v) for k, v in get_pool_stats().items() if k in ("active", "idle", "queued")}
+)
\ No newline at end of file
@@ -0,0 +1,63 @@
+import io
+from typing import Tuple
+from PIL import Image, ImageChops, ImageOps
+from app.config import settings
+from app.services.metrics import Counter, register_metric
+
+IMAGES_PREPARED = register_metric(Counter("parlai_image_prep_total", "Screenshots prepared for the vision model, by result."))
+IMAGE_BYTES = register_metric(Counter("parlai_image_prep_bytes_total", "Screenshot bytes before (in) and after (out) preparation."))
+
+MAGIC_MIME = [
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "image/webp"),
+]
+
+def sniff_mime(image_bytes: bytes) -> str:
+    for magic, mime in MAGIC_MIME:
+        if image_bytes.startswith(magic): return mime
+    return "image/jpeg"
+
+def crop_margins(img: Image.Image, tolerance: int = 12, padding: int = 8) -> Image.Image:
+    """Trims flat borders that match the top-left pixel colour."""
+    background = Image.new(img.mode, img.size, img.getpixel((0, 0)))
+    diff = ImageChops.difference(img, background).convert("L").point(lambda p: 255 if p > tolerance else 0)
+    bbox = diff.getbbox()
+    if not bbox: return img
+    left, top, right, bottom = bbox
+    return img.crop((max(0, left - padding), max(0, top - padding), min(img.width, right + padding), min(img.height, bottom + padding)))
+
+def prepare_image(image_bytes: bytes) -> Tuple[bytes, str, str]:
+    """Returns (bytes, mime type, detail level) ready for the vision prompt."""
+    IMAGE_BYTES.inc(len(image_bytes), direction="in")
+    result = "prepared"
+    try:
+        img = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes)))
+        if img.mode != "RGB":
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.split()[3])
+        img = crop_margins(img)
+
+        long_side, short_side = max(img.size), min(img.size)
+        scale = min(1.0, settings.VISION_MAX_LONG_SIDE / long_side, settings.VISION_MAX_SHORT_SIDE / short_side)
+        if scale < 1.0:
+            img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))), Image.LANCZOS)
+        detail = "low" if max(img.size) <= settings.VISION_LOW_DETAIL_MAX else "high"
+
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=settings.VISION_JPEG_QUALITY, optimize=True)
+        data, mime = out.getvalue(), "image/jpeg"
+        if len(data) >= len(image_bytes):
+            # Already compact (e.g. a small PNG): keep the original encoding
+            data, mime = image_bytes, sniff_mime(image_bytes)
+    except Exception as e:
+        print(f"Image Prep Warning: {e}")
+        result = "fallback"
+        data, mime, detail = image_bytes, sniff_mime(image_bytes), "auto"
+
+    IMAGES_PREPARED.inc(result=result)
+    IMAGE_BYTES.inc(len(data), direction="out")
+    print(f"Image Prep: {len(image_bytes)} -> {len(data)} bytes ({mime}, detail={detail})")
+    return data, mime, detail
\ No newline at end of file
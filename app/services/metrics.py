@@ -0,0 +1,165 @@
+import asyncio
+import bisect
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# Prometheus-style in-process metrics: stage latency histograms, cache hit/miss
+# counters and executor queue depth, plus per-request stage totals for Server-Timing.
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series: Dict[Tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(key)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{_labels(key)} {cumulative}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0.0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{_labels(k)} {v:g}" for k, v in items]
+        return lines
+
+def _labels(key: Tuple) -> str:
+    if not key: return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in key) + "}"
+
+STAGE_SECONDS = Histogram("parlai_stage_seconds", "Time spent per pipeline stage.")
+REQUEST_SECONDS = Histogram("parlai_request_seconds", "HTTP request latency by route.")
+CACHE_REQUESTS = Counter("parlai_cache_requests_total", "Cache lookups by cache and result.")
+
+# name -> callable returning the current value (executor queues, cache sizes...)
+GAUGES: Dict[str, Tuple[str, Callable[[], Dict[Tuple, float]]]] = {}
+
+# Per-request {stage: [total_seconds, count]}; the dict is shared by reference
+# so spans recorded in child tasks and copied contexts land on the same request
+_REQUEST_TIMINGS: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("request_timings", default=None)
+
+@contextlib.contextmanager
+def span(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _REQUEST_TIMINGS.get()
+        if timings is not None:
+            entry = timings.setdefault(stage, [0.0, 0])
+            entry[0] += elapsed
+            entry[1] += 1
+
+def timed(stage: str):
+    """Decorator form of span() for whole sync or async functions."""
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+def register_gauge(name: str, help_text: str, collect: Callable[[], Dict[Tuple, float]]):
+    GAUGES[name] = (help_text, collect)
+
+EXECUTORS = {}
+
+def register_executor(name: str, executor):
+    """Exposes a ThreadPoolExecutor's pending work items as parlai_executor_queue_depth."""
+    EXECUTORS[name] = executor
+
+def _executor_depths() -> Dict[Tuple, float]:
+    return {(("executor", name),): float(ex._work_queue.qsize()) for name, ex in EXECUTORS.items()}
+
+register_gauge("parlai_executor_queue_depth", "Work items waiting for a thread, by executor.", _executor_depths)
+
+def run_in_context(func, *args):
+    """Wraps func for run_in_executor so spans inside the thread count toward the current request."""
+    return functools.partial(contextvars.copy_context().run, func, *args)
+
+def start_request_timings() -> contextvars.Token:
+    return _REQUEST_TIMINGS.set({})
+
+def finish_request_timings(token: contextvars.Token) -> dict:
+    timings = _REQUEST_TIMINGS.get() or {}
+    _REQUEST_TIMINGS.reset(token)
+    return timings
+
+def server_timing_header(timings: dict) -> str:
+    parts = []
+    for stage, (total, count) in sorted(timings.items(), key=lambda kv: -kv[1][0]):
+        name = stage.replace(".", "_")
+        parts.append(f'{name};dur={total * 1000:.1f};desc="{stage} x{count}"')
+    return ", ".join(parts)
+
+METRICS = [STAGE_SECONDS, REQUEST_SECONDS, CACHE_REQUESTS]
+
+def register_metric(metric):
+    METRICS.append(metric)
+    return metric
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    for name, (help_text, collect) in GAUGES.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        try:
+            lines += [f"{name}{_labels(k)} {v:g}" for k, v in collect().items()]
+        except Exception as e:
+            print(f"Metrics Gauge Error ({name}): {e}")
+    return "\n".join(lines) + "\n"
\ No newline at end of file
@@ -1,84 +1,128 @@
-from nba_api.stats.static import players
-from nba_api.stats.endpoints import playergamelog, commonplayerinfo
-import pandas as pd
+import asyncio
+import unicodedata
+from datetime import datetime
+from app.config import settings
+from app.services.result_cache import invalidate_results
+from app.services.metrics import timed
+from app.services.upstream import NBA_API, is_throttle_error
 
+# nba_api is imported on first use to keep app startup fast
+
+# League-wide roster status, rebuilt off the request path and swapped in whole
+ROSTER_CACHE = {"snapshot": None}
+
+def _normalize(name: str) -> str:
+    nfkd_form = unicodedata.normalize('NFKD', name)
+    plain_ascii = "".join([c for c in nfkd_form if not unicodedata.combining(c)])
+    return " ".join(plain_ascii.lower().replace(".", "").split())
+
+def _roster_status(value) -> str:
+    # CommonAllPlayers reports ROSTERSTATUS as 1/0, CommonPlayerInfo as "Active"/"Inactive"
+    if isinstance(value, str) and not value.isdigit(): return value.title()
+    try: return "Active" if int(value) == 1 else "Inactive"
+    except (TypeError, ValueError): return "Active"
+
+@timed("nba_api.roster")
+def build_roster_snapshot() -> dict:
+    """One CommonAllPlayers call covers every current-season player's roster status."""
+    from nba_api.stats.endpoints import commonallplayers
+    df = commonallplayers.CommonAllPlayers(is_only_current_season=1).get_data_frames()[0]
+    by_id, by_name = {}, {}
+    for pid, name, status in zip(df['PERSON_ID'], df['DISPLAY_FIRST_LAST'], df['ROSTERSTATUS']):
+        by_id[int(pid)] = _roster_status(status)
+        by_name.setdefault(_normalize(str(name)), by_id[int(pid)])
+    return {"timestamp": datetime.now(), "by_id": by_id, "by_name": by_name, "resolved": {}}
+
+def refresh_nba_roster():
+    print("UPDATING NBA ROSTER STATUS...")
+    ROSTER_CACHE["snapshot"] = build_roster_snapshot()
+    invalidate_results("NBA roster status refreshed")
+
+async def roster_refresh_loop():
+    while True:
+        try:
+            await NBA_API.run(refresh_nba_roster)
+            NBA_API.report(throttled=False)
+        except Exception as e:
+            print(f"NBA Roster Refresh Error: {e}")
+            # Only 429s/timeouts mean stats.nba.com wants us to slow down
+            if is_throttle_error(e): NBA_API.report(throttled=True)
+        await asyncio.sleep(settings.NBA_ROSTER_REFRESH_SECONDS)
+
+@timed("nba.status")
 def get_nba_status(player_name: str) -> str:
     """Checks if player is Active or Inactive on the roster."""
+    snapshot = ROSTER_CACHE["snapshot"]
+    if snapshot is None: return "Active" # Snapshot still loading
+    
+    key = _normalize(player_name)
+    if key in snapshot["by_name"]: return snapshot["by_name"][key]
+    if key in snapshot["resolved"]: return snapshot["resolved"][key]
+    
+    # Spelling variants: resolve through the bundled static player list (no HTTP)
     try:
+        from nba_api.stats.static import players
         nba_players = players.find_players_by_full_name(player_name)
-        if not nba_players: return "Active"
-        pid = nba_players[0]['id']
-        
-        # Fetch Info
-        info = commonplayerinfo.CommonPlayerInfo(player_id=pid)
-        df = info.get_data_frames()[0]
-        
-        if df.empty: return "Active"
-        
-        # 'ROSTERSTATUS' usually contains "Active" or "Inactive"
-        status = df.iloc[0]['ROSTERSTATUS']
-        return str(status).title() # "Active"
+        if not nba_players: status = "Active"
+        else: status = snapshot["by_id"].get(nba_players[0]['id'], "Inactive")
     except:
-        return "Active"
+        status = "Active"
+    snapshot["resolved"][key] = status
+    return status
 
-def get_nba_real_stats(player_name: str, prop_type: str) -> dict:
+@timed("nba_api.game_log")
+def fetch_nba_game_log(player_name: str) -> dict:
     """
-    Fetches stats + metadata (minutes, dates, home/away).
+    Fetches the last 10 games once, with every stat column a prop can need.
+    Returns {} when the player is unknown; API and parse errors propagate so the
+    caller can tell throttling (429/timeout) from other failures.
     """
     print(f"NBA API: Fetching deep data for {player_name}...")
     
-    try:
-        # 1. Find Player
-        nba_players = players.find_players_by_full_name(player_name)
-        if not nba_players: return {}
-        player_id = nba_players[0]['id']
-        
-        # 2. Get Logs
-        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season='2024-25')
-        df = gamelog.get_data_frames()[0]
-        if df.empty:
-            gamelog = playergamelog.PlayerGameLog(player_id=player_id, season='2023-24')
-            df = gamelog.get_data_frames()[0]
+    from nba_api.stats.static import players
+    from nba_api.stats.endpoints import playergamelog
 
-        # 3. Process Data
-        logs = []
-        minutes_list = []
-        dates_list = []
-        venues_list = []
-        
-        prop_clean = prop_type.lower().replace(" ", "")
-        
-        last_10 = df.head(10)
-        
-        for _, row in last_10.iterrows():
-            pts, reb, ast, threes = row['PTS'], row['REB'], row['AST'], row['FG3M']
-            
-            if "pra" in prop_clean: val = pts + reb + ast
-            elif "rebs+asts" in prop_clean: val = reb + ast
-            elif "pts+rebs" in prop_clean: val = pts + reb
-            elif "assist" in prop_clean: val = ast
-            elif "rebound" in prop_clean: val = reb
-            elif "three" in prop_clean: val = threes
-            else: val = pts
-            
-            logs.append(float(val))
-            minutes_list.append(row['MIN']) 
-            dates_list.append(row['GAME_DATE']) 
-            venues_list.append("Home" if "vs." in str(row['MATCHUP']) else "Away")
+    # 1. Find Player
+    nba_players = players.find_players_by_full_name(player_name)
+    if not nba_players: return {}
+    player_id = nba_players[0]['id']
+    
+    # 2. Get Logs
+    gamelog = playergamelog.PlayerGameLog(player_id=player_id, season='2024-25')
+    df = gamelog.get_data_frames()[0]
+    if df.empty:
+        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season='2023-24')
+        df = gamelog.get_data_frames()[0]
 
-        # Reverse lists 
-        logs.reverse()
-        minutes_list.reverse()
-        dates_list.reverse()
-        venues_list.reverse()
+    # 3. Keep the raw columns, oldest game first
+    last_10 = df.head(10).iloc[::-1]
+    return {
+        "PTS": last_10['PTS'].astype(float).tolist(),
+        "REB": last_10['REB'].astype(float).tolist(),
+        "AST": last_10['AST'].astype(float).tolist(),
+        "FG3M": last_10['FG3M'].astype(float).tolist(),
+        "minutes": last_10['MIN'].tolist(),
+        "dates": last_10['GAME_DATE'].tolist(),
+        "venues": ["Home" if "vs." in str(m) else "Away" for m in last_10['MATCHUP']]
+    }
 
-        return {
-            "logs": logs,
-            "minutes": minutes_list,
-            "dates": dates_list,
-            "venues": venues_list
-        }
+def nba_logs_for_prop(game_log: dict, prop_type: str) -> dict:
+    """Projects a cached game log onto one prop type (PTS, REB, AST, PRA, threes)."""
+    if not game_log: return {}
+    prop_clean = prop_type.lower().replace(" ", "")
+    pts, reb, ast, threes = game_log['PTS'], game_log['REB'], game_log['AST'], game_log['FG3M']
+    
+    if "pra" in prop_clean: logs = [p + r + a for p, r, a in zip(pts, reb, ast)]
+    elif "rebs+asts" in prop_clean: logs = [r + a for r, a in zip(reb, ast)]
+    elif "pts+rebs" in prop_clean: logs = [p + r for p, r in zip(pts, reb)]
+    elif "assist" in prop_clean: logs = list(ast)
+    elif "rebound" in prop_clean: logs = list(reb)
+    elif "three" in prop_clean: logs = list(threes)
+    else: logs = list(pts)
 
-    except Exception as e:
-        print(f"NBA API Failed: {e}")
-        return {}
\ No newline at end of file
+    return {
+        "logs": logs,
+        "minutes": list(game_log['minutes']),
+        "dates": list(game_log['dates']),
+        "venues": list(game_log['venues'])
+    }
\ No newline at end of file
@@ -0,0 +1,52 @@
+import glob
+import os
+import time
+from typing import TYPE_CHECKING
+from app.config import settings
+
+# NFL datasets published once as uncompressed Arrow IPC files under DATA_DIR and
+# memory-mapped read-only by every worker, so N workers share one copy in the page cache.
+# pyarrow is imported on first use to keep app startup fast.
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
+FRAMES_DIR = os.path.join(settings.DATA_DIR, "nfl_frames")
+# Superseded files stay this long so workers still attaching to them can finish
+PRUNE_AFTER_SECONDS = 3600
+
+def publish_table(name: str, table: "pa.Table") -> str:
+    """Writes `table` as a single-batch Arrow file (atomic rename) and returns its path."""
+    import pyarrow as pa
+
+    os.makedirs(FRAMES_DIR, exist_ok=True)
+    path = os.path.join(FRAMES_DIR, f"{name}-{os.getpid()}-{time.time_ns()}.arrow")
+    tmp = path + ".tmp"
+    # One record batch per file, so every column is a single contiguous buffer
+    table = table.combine_chunks()
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(tmp, path)
+    _prune(name, keep=path)
+    return path
+
+def _prune(name: str, keep: str):
+    cutoff = time.time() - PRUNE_AFTER_SECONDS
+    for old in glob.glob(os.path.join(FRAMES_DIR, f"{name}-*.arrow")):
+        try:
+            if old != keep and os.path.getmtime(old) < cutoff: os.remove(old)
+        except OSError: pass
+
+def attach_table(path: str) -> "pa.Table":
+    """Memory-maps a published file; columns reference the mapping, nothing is copied."""
+    import pyarrow as pa
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+def column_view(table: "pa.Table", name: str) -> "np.ndarray":
+    # Fixed-width, null-free columns only: raises instead of silently copying
+    column = table.column(name)
+    if column.num_chunks == 0:
+        import numpy as np
+        return np.array([], dtype=column.type.to_pandas_dtype())
+    return column.chunk(0).to_numpy(zero_copy_only=True)
@@ -1,83 +1,290 @@
-import nfl_data_py as nfl
-import pandas as pd
+import asyncio
+import json
 from datetime import datetime
+from typing import Any, Callable, Optional, Tuple, TYPE_CHECKING
+from app.config import settings
+from app.services.result_cache import invalidate_results
+from app.services.metrics import timed
+from app.services.shared_cache import load_shared
+from app.services.nfl_frames import publish_table, attach_table, column_view
+
+# nfl_data_py, pandas, numpy and pyarrow are imported on first use to keep app startup fast
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 # Caches to prevent re-downloading large datasets
 NFL_CACHE = {}
-INJURY_CACHE = {"data": None, "timestamp": None}
+NFL_INDEX = {}  # year -> weekly stats pre-sorted by player with prop columns as arrays
+# "status" is the derived latest-status map; it is replaced wholesale on every refresh
+INJURY_CACHE = {"data": None, "timestamp": None, "status": None}
+
+def _name_key(names: "pd.Series") -> "pd.Series":
+    return names.str.lower().str.replace(".", "", regex=False).str.replace(" ", "", regex=False)
+
+PROP_COLUMNS = ["targets", "rush_rec_yds", "receiving_yards", "rushing_yards", "fantasy", "touchdowns", "receptions"]
+
+def weekly_index_table(df: "pd.DataFrame") -> "pa.Table":
+    """
+    Computes every prop column once, sorted by (player, week), as fixed-width Arrow
+    columns; each player's row range travels in the schema metadata.
+    """
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+    def num(col):
+        if col not in df.columns: return pd.Series(np.nan, index=df.index)
+        return pd.to_numeric(df[col], errors='coerce')
+
+    rush, rec = num('rushing_yards'), num('receiving_yards')
+    rush_td, rec_td, receptions = num('rushing_tds'), num('receiving_tds'), num('receptions')
+    frame = pd.DataFrame({
+        "key": _name_key(df['player_display_name']),
+        "week": num('week'),
+        "is_home": (df['location'] == 'Home') if 'location' in df.columns else False,
+        "targets": num('targets'),
+        "rush_rec_yds": rush + rec,
+        "receiving_yards": rec,
+        "rushing_yards": rush,
+        # Standard Fantasy Scoring
+        "fantasy": (rush * 0.1 + rec * 0.1 + rush_td * 6 + rec_td * 6 + receptions * 1.0).round(1),
+        "touchdowns": rush_td + rec_td,
+        "receptions": receptions,
+    })
+    frame = frame.dropna(subset=["key"]).sort_values(by=["key", "week"], kind="mergesort")
+
+    keys = frame["key"].to_numpy()
+    bounds = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], bounds)) if len(keys) else np.array([], dtype=int)
+    stops = np.concatenate((bounds, [len(keys)])) if len(keys) else np.array([], dtype=int)
+    slices = {keys[a]: (int(a), int(b)) for a, b in zip(starts, stops)}
+
+    # NaN weeks stay NaN (not null) and is_home is uint8, so every column maps zero-copy
+    arrays = {
+        "week": frame["week"].to_numpy(dtype=float),
+        "is_home": frame["is_home"].to_numpy(dtype=np.uint8),
+        **{c: frame[c].fillna(0.0).to_numpy(dtype=float) for c in PROP_COLUMNS},
+    }
+    table = pa.table({name: pa.array(values) for name, values in arrays.items()})
+    return table.replace_schema_metadata({"slices": json.dumps(slices)})
+
+def index_from_table(table: "pa.Table") -> dict:
+    """NFL_INDEX entry whose arrays are views over `table` (a memory-mapped file when attached)."""
+    slices = {k: tuple(v) for k, v in json.loads(table.schema.metadata[b"slices"]).items()}
+    return {
+        "slices": slices,
+        "names": list(slices),
+        "week": column_view(table, "week"),
+        "is_home": column_view(table, "is_home").view(bool),
+        "columns": {c: column_view(table, c) for c in PROP_COLUMNS},
+        "matches": {},
+    }
+
+def build_weekly_index(df: "pd.DataFrame") -> dict:
+    """Computes every prop column once and groups rows by normalized player name."""
+    return index_from_table(weekly_index_table(df))
+
+def install_weekly_data(year: int, df: "pd.DataFrame"):
+    index = build_weekly_index(df)
+    NFL_CACHE[year] = df
+    NFL_INDEX[year] = index
+    invalidate_results("NFL weekly stats refreshed")
+
+def publish_weekly_data(year: int, df: "pd.DataFrame") -> dict:
+    import pyarrow as pa
+    return {
+        "frame": publish_table(f"weekly_{year}", pa.Table.from_pandas(df, preserve_index=False)),
+        "index": publish_table(f"weekly_index_{year}", weekly_index_table(df)),
+    }
+
+def attach_weekly_data(year: int, published: dict):
+    """Installs a published year read-only: NFL_CACHE holds the mapped Arrow table, not a DataFrame."""
+    index = index_from_table(attach_table(published["index"]))
+    NFL_CACHE[year] = attach_table(published["frame"])
+    NFL_INDEX[year] = index
+    invalidate_results("NFL weekly stats refreshed")
+
+def _weekly_index(year: int) -> Optional[dict]:
+    # Never download on the request path: the startup preload owns that. Every installer
+    # (install_weekly_data / attach_weekly_data) sets NFL_CACHE and NFL_INDEX together.
+    return NFL_INDEX.get(year)
+
+def _prop_column(prop_clean: str):
+    # Prop Mapping (first match wins, same order as the slip wording checks)
+    if "targets" in prop_clean: return "targets"
+    elif "rush+rec" in prop_clean: return "rush_rec_yds"
+    elif "rec" in prop_clean and "yds" in prop_clean: return "receiving_yards"
+    elif "rush" in prop_clean and "yds" in prop_clean: return "rushing_yards"
+    elif "fantasy" in prop_clean: return "fantasy"
+    elif "touchdown" in prop_clean: return "touchdowns"
+    elif "reception" in prop_clean: return "receptions"
+    return None
+
+def build_injury_map(df: "pd.DataFrame") -> Optional[dict]:
+    """Reduces the injury report to each player's latest report_status."""
+    import numpy as np
+    import pandas as pd
+
+    # nfl_data_py uses 'full_name' for injuries, not 'player'
+    name_col = next((c for c in ('full_name', 'player', 'name') if c in df.columns), None)
+    if name_col is None:
+        print("Injury DB Column 'full_name' missing.")
+        return None
+
+    frame = pd.DataFrame({
+        "key": _name_key(df[name_col]),
+        "week": pd.to_numeric(df['week'], errors='coerce') if 'week' in df.columns else np.nan,
+        "pos": np.arange(len(df)),
+        "status": df['report_status'] if 'report_status' in df.columns else None,
+    }).dropna(subset=["key"])
+    # Most recent report per player (sort by week desc, first row of the report on ties)
+    frame = frame.sort_values(by="week", ascending=False, kind="mergesort").drop_duplicates("key")
+
+    latest = {}
+    for key, week, pos, status in frame.itertuples(index=False):
+        # 'report_status' contains "Questionable", "Out", etc.
+        latest[key] = (week if not pd.isna(week) else float("-inf"), pos, "Active" if pd.isna(status) else str(status))
+    return {"latest": latest, "matches": {}}
+
+def injury_status_table(status: dict) -> "pa.Table":
+    import pyarrow as pa
+    latest = status["latest"]
+    return pa.table({
+        "key": pa.array(list(latest), pa.string()),
+        "week": pa.array([v[0] for v in latest.values()], pa.float64()),
+        "pos": pa.array([v[1] for v in latest.values()], pa.int64()),
+        "status": pa.array([v[2] for v in latest.values()], pa.string()),
+    })
+
+def injury_map_from_table(table: "pa.Table") -> dict:
+    # One row per player, so rebuilding the lookup dict is cheap next to the raw report
+    columns = [table.column(c).to_pylist() for c in ("key", "week", "pos", "status")]
+    return {"latest": {key: (week, pos, status) for key, week, pos, status in zip(*columns)}, "matches": {}}
+
+def install_injury_data(df: "pd.DataFrame", timestamp: datetime):
+    status = build_injury_map(df)
+    INJURY_CACHE["data"] = df
+    INJURY_CACHE["timestamp"] = timestamp
+    INJURY_CACHE["status"] = status
+    invalidate_results("NFL injury report refreshed")
+
+def publish_injury_data(df: "pd.DataFrame", timestamp: datetime) -> dict:
+    import pyarrow as pa
+    status = build_injury_map(df)
+    return {
+        "frame": publish_table("injuries", pa.Table.from_pandas(df, preserve_index=False)),
+        "status": publish_table("injury_status", injury_status_table(status)) if status else None,
+        "timestamp": timestamp.isoformat(),
+    }
+
+def attach_injury_data(published: dict):
+    status = injury_map_from_table(attach_table(published["status"])) if published["status"] else None
+    INJURY_CACHE["data"] = attach_table(published["frame"])
+    INJURY_CACHE["timestamp"] = datetime.fromisoformat(published["timestamp"])
+    INJURY_CACHE["status"] = status
+    invalidate_results("NFL injury report refreshed")
 
-def preload_nfl_data():
-    """Downloads heavy datasets into RAM on startup."""
+def _load_published(key: str, read: Callable[[], Any], publish: Callable[[Any], dict],
+                    attach: Callable[[dict], None], install: Callable[[Any], None], **freshness):
+    """
+    One worker publishes Arrow files (path dict goes through the shared cache), every worker
+    attaches. If the files cannot be written, the downloaded data is installed in-process.
+    """
+    downloaded = []
+    def publish_local(data) -> Optional[dict]:
+        try:
+            return publish(data)
+        except Exception as e:
+            # Unwritable DATA_DIR or an Arrow conversion error: keep the data in this worker
+            print(f"NFL Frame Publish Warning: {e}")
+            install(data)
+            return None
+    def load():
+        downloaded.append(read())
+        return publish_local(downloaded[0])
+
+    entry = load_shared(key, load, settings.SHARED_CACHE_TTL, **freshness)
+    if entry is None: return
+    try:
+        attach(entry[1])
+    except OSError as e:
+        # Published on another host (Redis backend) or already pruned: publish a local copy
+        print(f"NFL Frame Attach Warning: {e}")
+        published = publish_local(downloaded[0] if downloaded else read())
+        if published is not None: attach(published)
+
+def load_weekly_data(year: int, read_frame: Callable[[], "pd.DataFrame"], **freshness):
+    _load_published(f"nfl_weekly_arrow:{year}", read_frame,
+                    lambda df: publish_weekly_data(year, df),
+                    lambda published: attach_weekly_data(year, published),
+                    lambda df: install_weekly_data(year, df), **freshness)
+
+def load_injury_data(read_frame: Callable[[], Tuple["pd.DataFrame", datetime]], **freshness):
+    _load_published("nfl_injuries_arrow:2024", read_frame, lambda report: publish_injury_data(*report),
+                    attach_injury_data, lambda report: install_injury_data(*report), **freshness)
+
+def _download_injuries():
+    import nfl_data_py as nfl
+    print("Downloading NFL Injury Report...")
+    return nfl.import_injuries([2024]), datetime.now()
+
+@timed("nfl.download")
+def refresh_injury_report():
+    # A report another worker fetched within the last half interval counts as this refresh
+    load_injury_data(_download_injuries, max_age=settings.INJURY_REFRESH_SECONDS / 2)
+
+async def injury_refresh_loop():
+    loop = asyncio.get_event_loop()
+    while True:
+        await asyncio.sleep(settings.INJURY_REFRESH_SECONDS)
+        try: await loop.run_in_executor(None, refresh_injury_report)
+        except Exception as e: print(f"Injury Refresh Error: {e}")
+
+@timed("nfl.download")
+def preload_nfl_data(force: bool = False):
+    """Downloads heavy datasets into RAM on startup (force=True re-downloads warm data)."""
     current_year = 2024
     try:
-        if current_year not in NFL_CACHE:
-            print("(Background) Downloading NFL Weekly Stats...")
-            NFL_CACHE[current_year] = nfl.import_weekly_data([current_year])
+        import nfl_data_py as nfl
+        if force or current_year not in NFL_CACHE:
+            def download():
+                print("(Background) Downloading NFL Weekly Stats...")
+                return nfl.import_weekly_data([current_year])
+            # Single-flight across workers: one downloads and publishes, the rest map its files
+            load_weekly_data(current_year, download, force=force)
             
-        if INJURY_CACHE["data"] is None:
-            print("(Background) Downloading NFL Injury Report...")
-            INJURY_CACHE["data"] = nfl.import_injuries([current_year])
-            INJURY_CACHE["timestamp"] = datetime.now()
+        if force or INJURY_CACHE["status"] is None:
+            load_injury_data(_download_injuries, force=force)
     except Exception as e:
         print(f"Preload Warning: {e}")
 
+@timed("nfl.injury")
 def get_nfl_injury_status(player_name: str) -> str:
     """
-    Fetches the latest official injury report for the player.
+    Looks the player up in the latest official injury report snapshot.
     """
-    current_year = 2024 
-    
-    try:
-        # "if not df" raises ValueError in Pandas. Must use "is None".
-        if INJURY_CACHE["data"] is None or (datetime.now() - INJURY_CACHE["timestamp"]).total_seconds() > 3600:
-            print("Downloading NFL Injury Report...")
-            INJURY_CACHE["data"] = nfl.import_injuries([current_year])
-            INJURY_CACHE["timestamp"] = datetime.now()
-        
-        df = INJURY_CACHE["data"]
-        
-        # nfl_data_py uses 'full_name' for injuries, not 'player'
-        name_col = 'full_name'
-        if 'full_name' not in df.columns:
-            # Fallbacks just in case schema changes
-            if 'player' in df.columns: name_col = 'player'
-            elif 'name' in df.columns: name_col = 'name'
-            else:
-                print("Injury DB Column 'full_name' missing.")
-                return "Active"
-
-        # Normalize Name for matching
-        target = player_name.lower().replace(".", "").replace(" ", "")
-        
-        def name_match(row_name):
-            if not isinstance(row_name, str): return False
-            clean = row_name.lower().replace(".", "").replace(" ", "")
-            return target in clean or clean in target
-
-        # Find Player using the correct column
-        player_df = df[df[name_col].apply(name_match)].copy()
-        
-        if player_df.empty:
-            return "Fully Healthy" # Not on the report = Healthy
-
-        # Get most recent report (sort by week desc)
-        # Ensure 'week' is numeric for sorting
-        if 'week' in player_df.columns:
-            player_df['week'] = pd.to_numeric(player_df['week'], errors='coerce')
-            latest = player_df.sort_values(by='week', ascending=False).iloc[0]
-        else:
-            latest = player_df.iloc[0]
-        
-        # 'report_status' contains "Questionable", "Out", etc.
-        status = latest.get('report_status')
-        
-        if pd.isna(status): return "Active"
-        return str(status)
+    status_map = INJURY_CACHE["status"]
+    if status_map is None:
+        return "Active" # Report not loaded yet, never download on the request path
 
-    except Exception as e:
-        print(f"Injury Fetch Error: {e}")
-        return "Active"
+    # Normalize Name for matching
+    target = player_name.lower().replace(".", "").replace(" ", "")
+    matches = status_map["matches"]
+    if target in matches:
+        return matches[target]
 
+    # Substring match either way; the newest report among matching names wins
+    hits = [v for k, v in status_map["latest"].items() if target in k or k in target]
+    if not hits:
+        status = "Fully Healthy" # Not on the report = Healthy
+    else:
+        status = min(hits, key=lambda v: (-v[0], v[1]))[2]
+    if len(matches) > 50000: matches.clear()
+    matches[target] = status
+    return status
+
+@timed("nfl.stats")
 def get_nfl_real_stats(player_name: str, prop_type: str) -> dict:
     """
     Fetches real NFL 2024 weekly stats.
@@ -85,64 +292,38 @@ def get_nfl_real_stats(player_name: str, prop_type: str) -> dict:
     print(f"NFL DATA: Fetching real data for {player_name}...")
     current_year = 2024
     
+    import numpy as np
     try:
-        if current_year not in NFL_CACHE:
-            print("Downloading NFL Weekly Data...")
-            NFL_CACHE[current_year] = nfl.import_weekly_data([current_year])
-        
-        df = NFL_CACHE[current_year]
+        index = _weekly_index(current_year)
+        if index is None:
+            print("NFL weekly data still loading, using fallback.")
+            return {}
         target = player_name.lower().replace(".", "").replace(" ", "")
-        
-        def name_match(row_name):
-            if not isinstance(row_name, str): return False
-            clean = row_name.lower().replace(".", "").replace(" ", "")
-            return target in clean or clean in target
-
-        # Use 'player_display_name' for stats data
-        player_df = df[df['player_display_name'].apply(name_match)]
-        
-        if player_df.empty:
+
+        # Substring match either way, resolved once per query against the unique names
+        keys = index["matches"].get(target)
+        if keys is None:
+            keys = [k for k in index["names"] if target in k or k in target]
+            if len(index["matches"]) > 50000: index["matches"].clear()
+            index["matches"][target] = keys
+
+        if not keys:
             return {}
 
-        # Sort by Week (Latest first) and take last 10
-        player_df = player_df.sort_values(by='week', ascending=False).head(10)
-        
-        logs = []
-        venues_list = []
-        
-        prop_clean = prop_type.lower().replace(" ", "")
-        
-        for _, row in player_df.iterrows():
-            val = 0.0
-            
-            # Prop Mapping
-            if "targets" in prop_clean: val = row['targets']
-            elif "rush+rec" in prop_clean: val = row['rushing_yards'] + row['receiving_yards']
-            elif "rec" in prop_clean and "yds" in prop_clean: val = row['receiving_yards']
-            elif "rush" in prop_clean and "yds" in prop_clean: val = row['rushing_yards']
-            elif "fantasy" in prop_clean:
-                # Standard Fantasy Scoring
-                pts = (row['rushing_yards'] * 0.1) + \
-                      (row['receiving_yards'] * 0.1) + \
-                      (row['rushing_tds'] * 6) + \
-                      (row['receiving_tds'] * 6) + \
-                      (row['receptions'] * 1.0)
-                val = round(pts, 1)
-            elif "touchdown" in prop_clean: val = row['rushing_tds'] + row['receiving_tds']
-            elif "reception" in prop_clean: val = row['receptions']
-            
-            if pd.isna(val): val = 0.0
-            logs.append(float(val))
-            
-            # Location metadata
-            venues_list.append("Home" if row.get('location') == 'Home' else "Away")
-            
-        logs.reverse()
-        venues_list.reverse()
-        
+        # Rows are sorted by (player, week): take the latest 10 weeks, oldest first
+        if len(keys) == 1:
+            start, stop = index["slices"][keys[0]]
+            rows = np.arange(max(start, stop - 10), stop)
+        else:
+            rows = np.concatenate([np.arange(*index["slices"][k]) for k in keys])
+            rows = rows[np.argsort(index["week"][rows], kind="stable")][-10:]
+
+        col = _prop_column(prop_type.lower().replace(" ", ""))
+        values = index["columns"][col][rows] if col else np.zeros(len(rows))
+
         return {
-            "logs": logs,
-            "venues": venues_list,
+            "logs": values.tolist(),
+            "venues": np.where(index["is_home"][rows], "Home", "Away").tolist(),
             "minutes": [], 
             "dates": []
         }
@@ -0,0 +1,171 @@
+import threading
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+from app.services.metrics import timed
+
+# Latent correlation between two legs (Gaussian copula), before the Over/Under sign
+SAME_PLAYER_RHO = 0.5
+SAME_TEAM_RHO = 0.15
+# Same player, prop and line: one outcome, so an Over and an Under on it are mutually exclusive
+SAME_MARKET_RHO = 1.0
+
+# Shrink thin game logs toward a coin flip: weight = n / (n + PRIOR_GAMES)
+PRIOR_GAMES = 4
+MIN_LEG_PROB, MAX_LEG_PROB = 0.02, 0.98
+
+# Injury report caps (same status wording the bet scorer checks)
+OUT_LEG_PROB = MIN_LEG_PROB
+QUESTIONABLE_FACTOR = 0.75
+
+# Per-leg risk is tallied from a histogram of miss patterns (2**k bins) up to this many legs
+MAX_PATTERN_LEGS = 16
+
+_STD_NORMAL = NormalDist()
+
+# Standard normals are the dominant cost, so one fixed-seed block is drawn per sample
+# count and reused by every call: results are deterministic and slips compare on the same draws.
+NORMALS_CACHE: Dict[int, np.ndarray] = {}
+NORMALS_LOCK = threading.Lock()
+NORMALS_SEED = 1729
+
+def _is_under(operator: str) -> bool:
+    return "under" in (operator or "").lower()
+
+def leg_hit_probability(values: Sequence[float], line: float, operator: str, fallback: float = 0.5) -> float:
+    """P(leg hits) from its game-log distribution, modelled as Normal(mean, sd) against the line."""
+    logs = np.asarray(values, dtype=np.float64)
+    if logs.size == 0: return min(max(fallback, MIN_LEG_PROB), MAX_LEG_PROB)
+
+    mean = float(logs.mean())
+    sd = float(logs.std(ddof=1)) if logs.size > 1 else 0.0
+    if sd <= 0: sd = max(abs(mean) * 0.25, 1.0)
+
+    p_over = 1.0 - _STD_NORMAL.cdf((line - mean) / sd)
+    p = 1.0 - p_over if _is_under(operator) else p_over
+    p = 0.5 + (p - 0.5) * logs.size / (logs.size + PRIOR_GAMES)
+    return min(max(p, MIN_LEG_PROB), MAX_LEG_PROB)
+
+def injury_adjusted(p: float, injury_status: Optional[str]) -> float:
+    """A leg on a player reported OUT almost never cashes; Questionable/Doubtful is discounted."""
+    status = (injury_status or "").lower()
+    if "out" in status or "ir" in status or "inactive" in status: return min(p, OUT_LEG_PROB)
+    if "questionable" in status or "doubtful" in status: return max(p * QUESTIONABLE_FACTOR, MIN_LEG_PROB)
+    return p
+
+def leg_probability(leg: dict) -> float:
+    p = leg_hit_probability(leg.get("values") or [], float(leg.get("line") or 0.0), leg.get("operator"), leg.get("probability", 0.5))
+    return injury_adjusted(p, leg.get("injury_status"))
+
+def _same_market(a: dict, b: dict) -> bool:
+    players = set(a.get("players") or ())
+    return (bool(players) and players == set(b.get("players") or ()) and bool(a.get("prop"))
+            and a.get("prop") == b.get("prop") and float(a.get("line") or 0.0) == float(b.get("line") or 0.0))
+
+def _exclusive_caps(legs: List[dict], probs: np.ndarray):
+    """An Over and an Under on the same market can't both hit: their probabilities sum to at most 1."""
+    for i in range(len(legs)):
+        for j in range(i + 1, len(legs)):
+            if _is_under(legs[i].get("operator")) != _is_under(legs[j].get("operator")) and _same_market(legs[i], legs[j]):
+                probs[j] = min(probs[j], 1.0 - probs[i])
+
+def correlation_matrix(legs: List[dict]) -> np.ndarray:
+    """Shared players / teams move together; an Over paired with an Under flips the sign."""
+    k = len(legs)
+    corr = np.eye(k)
+    for i in range(k):
+        for j in range(i + 1, k):
+            a, b = legs[i], legs[j]
+            if _same_market(a, b): rho = SAME_MARKET_RHO
+            elif set(a.get("players") or ()) & set(b.get("players") or ()): rho = SAME_PLAYER_RHO
+            elif a.get("team") and a.get("team") == b.get("team"): rho = SAME_TEAM_RHO
+            else: continue
+            if _is_under(a.get("operator")) != _is_under(b.get("operator")): rho = -rho
+            corr[i, j] = corr[j, i] = rho
+    return corr
+
+def _cholesky(corr: np.ndarray) -> np.ndarray:
+    # Pairwise rules can yield an indefinite matrix (e.g. three mutually "opposite" legs)
+    try:
+        return np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        w, v = np.linalg.eigh(corr)
+        fixed = (v * np.clip(w, 1e-6, None)) @ v.T
+        d = np.sqrt(np.diag(fixed))
+        return np.linalg.cholesky(fixed / np.outer(d, d))
+
+def standard_normals(samples: int, width: int) -> np.ndarray:
+    block = NORMALS_CACHE.get(samples)
+    if block is None or block.shape[1] < width:
+        with NORMALS_LOCK:
+            block = NORMALS_CACHE.get(samples)
+            if block is None or block.shape[1] < width:
+                rng = np.random.default_rng(NORMALS_SEED)
+                block = rng.standard_normal((samples, max(width, 8)), dtype=np.float32)
+                NORMALS_CACHE[samples] = block
+    return block[:, :width]
+
+def _summarize(misses: np.ndarray, probs: np.ndarray) -> Dict:
+    samples, k = misses.shape
+    if k <= MAX_PATTERN_LEGS:
+        # Count each miss pattern once, then read every statistic off the 2**k histogram
+        bits = misses.view(np.uint8) @ (1 << np.arange(k, dtype=np.int64))
+        patterns = np.bincount(bits, minlength=1 << k)
+        codes = np.arange(1 << k)
+        lost = samples - int(patterns[0])
+        missed = [int(patterns[(codes >> i) & 1 == 1].sum()) for i in range(k)]
+        sole = [int(patterns[1 << i]) for i in range(k)]
+    else:
+        per_sample = misses.sum(axis=1)
+        lost = int((per_sample > 0).sum())
+        missed = misses.sum(axis=0).tolist()
+        sole = misses[per_sample == 1].sum(axis=0).tolist()
+
+    denom = max(lost, 1)
+    return {
+        "win_probability": 1.0 - lost / samples,
+        "independent_probability": float(np.prod(probs)),
+        "legs": [
+            {
+                "probability": float(probs[i]),
+                # Share of losing simulations in which this leg missed / was the only miss
+                "miss_share": missed[i] / denom,
+                "sole_miss_share": sole[i] / denom,
+            }
+            for i in range(k)
+        ],
+    }
+
+@timed("parlay.simulate")
+def simulate_parlays(slips: List[List[dict]], samples: Optional[int] = None) -> List[Dict]:
+    """
+    Monte Carlo over many slips at once. Each leg is a dict with "values" (game log),
+    "line", "operator", optional "players"/"team"/"prop" for correlation, an optional
+    "probability" used when the log is empty (pass [] for synthetic logs) and an optional
+    "injury_status" that caps the leg. Every slip reuses the same block of
+    standard normals (common random numbers), so a batch costs one matmul per slip.
+    """
+    samples = samples or settings.PARLAY_SIM_SAMPLES
+    widest = max((len(legs) for legs in slips), default=0)
+    if widest == 0: return [{"win_probability": 0.0, "independent_probability": 0.0, "legs": []} for _ in slips]
+
+    normals = standard_normals(samples, widest)
+
+    results = []
+    for legs in slips:
+        if not legs:
+            results.append({"win_probability": 0.0, "independent_probability": 0.0, "legs": []})
+            continue
+        probs = np.array([leg_probability(leg) for leg in legs])
+        _exclusive_caps(legs, probs)
+        thresholds = np.array([_STD_NORMAL.inv_cdf(p) for p in probs], dtype=np.float32)
+        chol = _cholesky(correlation_matrix(legs)).astype(np.float32)
+        latent = normals[:, :len(legs)] @ chol.T
+        results.append(_summarize(latent >= thresholds, probs))
+    return results
+
+def simulate_parlay(legs: List[dict], samples: Optional[int] = None) -> Dict:
+    return simulate_parlays([legs], samples)[0]
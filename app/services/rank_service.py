@@ -1,25 +1,50 @@
-import pandas as pd
 from datetime import datetime
 import asyncio
+import time
 
-from nba_api.stats.endpoints import leaguestandingsv3
-import nfl_data_py as nfl
+from app.config import settings
+from app.services.metrics import timed, record_cache
+from app.services.shared_cache import load_shared
+from app.services.upstream import NBA_API
+
+# nba_api and nfl_data_py are imported on first use to keep app startup fast
+
+RANK_TTL_SECONDS = 86400
 
 # Cache Storage
+# "data" keeps the original name -> rank map (used for partial matches),
+# "aliases" adds exact-only keys like abbreviations plus memoized lookups.
 RANK_CACHE = {
-    "NBA": {"timestamp": None, "data": {}},
-    "NFL": {"timestamp": None, "data": {}}
+    "NBA": {"timestamp": None, "data": {}, "aliases": {}},
+    "NFL": {"timestamp": None, "data": {}, "aliases": {}}
 }
+RANK_REFRESH_TASKS = {}
+
+def _store_ranks(league: str, rank_map: dict, extra_aliases: dict):
+    aliases = dict(rank_map)
+    for alias, rank in extra_aliases.items(): aliases.setdefault(alias, rank)
+    install_ranks(league, rank_map, aliases, datetime.now())
+
+def install_ranks(league: str, rank_map: dict, aliases: dict, timestamp: datetime):
+    # Single assignment so readers see either the old or the new table
+    RANK_CACHE[league] = {"timestamp": timestamp, "data": rank_map, "aliases": aliases}
 
+def _is_fresh(league: str) -> bool:
+    cached = RANK_CACHE[league]
+    return bool(cached["timestamp"]) and (datetime.now() - cached["timestamp"]).total_seconds() < RANK_TTL_SECONDS
+
+@timed("rank.nba_ranks")
 def get_nba_defense_ranks():
     """Fetches NBA Team Defensive Rankings (Points Allowed Per Game)"""
     try:
         # Check Cache (Valid for 24 hours)
-        cached = RANK_CACHE["NBA"]
-        if cached["timestamp"] and (datetime.now() - cached["timestamp"]).total_seconds() < 86400:
-            return cached["data"]
+        if _is_fresh("NBA"):
+            return RANK_CACHE["NBA"]["data"]
 
         print("UPDATING NBA DEFENSIVE RANKINGS...")
+        from nba_api.stats.endpoints import leaguestandingsv3
+        from nba_api.stats.static import teams as nba_teams
+
         # Get Standings
         standings = leaguestandingsv3.LeagueStandingsV3(season='2024-25')
         df = standings.get_data_frames()[0]
@@ -34,6 +59,7 @@ def get_nba_defense_ranks():
             return {}
 
         rank_map = {}
+        abbreviations = {}
         for rank, row in enumerate(df.itertuples(), 1):
             # Map Team Name & ID to Rank
             team_name = str(row.TeamName).lower()
@@ -41,21 +67,25 @@ def get_nba_defense_ranks():
             rank_map[team_name] = rank
             rank_map[city] = rank
             rank_map[f"{city} {team_name}"] = rank # "Los Angeles Lakers"
+            team = nba_teams.find_team_name_by_id(getattr(row, 'TeamID', None))
+            if team: abbreviations[team['abbreviation'].lower()] = rank # "LAL"
 
-        RANK_CACHE["NBA"] = {"timestamp": datetime.now(), "data": rank_map}
+        _store_ranks("NBA", rank_map, abbreviations)
         return rank_map
     except Exception as e:
         print(f"NBA Rank Error: {e}")
         return {}
 
+@timed("rank.nfl_ranks")
 def get_nfl_defense_ranks():
     """Fetches NFL Team Defensive Rankings (Points Allowed)"""
     try:
-        cached = RANK_CACHE["NFL"]
-        if cached["timestamp"] and (datetime.now() - cached["timestamp"]).total_seconds() < 86400:
-            return cached["data"]
+        if _is_fresh("NFL"):
+            return RANK_CACHE["NFL"]["data"]
 
         print("UPDATING NFL DEFENSIVE RANKINGS...")
+        import nfl_data_py as nfl
+
         df = nfl.import_seasonal_data([2024])
         
         # Sort by points allowed ('points_allowed')
@@ -70,34 +100,91 @@ def get_nfl_defense_ranks():
             team_abbr = str(row.team).lower()
             rank_map[team_abbr] = rank
 
-        RANK_CACHE["NFL"] = {"timestamp": datetime.now(), "data": rank_map}
+        # Let full names, cities and nicknames ("Seattle Seahawks", "Seattle", "Seahawks") resolve too
+        names = {}
+        try:
+            for row in nfl.import_team_desc().itertuples():
+                rank = rank_map.get(str(row.team_abbr).lower())
+                if rank is None: continue
+                full, nick = str(row.team_name).lower(), str(row.team_nick).lower()
+                names[full] = rank
+                names[nick] = rank
+                if full.endswith(f" {nick}"): names[full[:-len(nick) - 1]] = rank
+        except Exception as e:
+            print(f"NFL Team Alias Warning: {e}")
+
+        _store_ranks("NFL", rank_map, names)
         return rank_map
     except Exception as e:
         print(f"NFL Rank Error: {e}")
         return {}
 
+RANK_LOADERS = {"NBA": get_nba_defense_ranks, "NFL": get_nfl_defense_ranks}
+
+def _fetched_at(entry) -> float:
+    return entry[1].get("fetched", entry[0])
+
+def _load_shared_ranks(league: str) -> dict:
+    """Runs the league's loader in one worker and installs its table in every other."""
+    def fetch():
+        if not RANK_LOADERS[league](): return None
+        cached = RANK_CACHE[league]
+        # The loader returns a still-fresh table (e.g. restored from a snapshot) without
+        # fetching, so publish when it was fetched rather than when it was shared
+        return {"data": cached["data"], "aliases": dict(cached["aliases"]), "fetched": cached["timestamp"].timestamp()}
+    key = f"ranks:{league}"
+    entry = load_shared(key, fetch, settings.SHARED_CACHE_TTL, max_age=RANK_TTL_SECONDS)
+    if entry is not None and time.time() - _fetched_at(entry) >= RANK_TTL_SECONDS:
+        # Recently shared but old data: install it as stale so the next loader run really fetches
+        install_ranks(league, entry[1]["data"], dict(entry[1]["aliases"]), datetime.fromtimestamp(_fetched_at(entry)))
+        entry = load_shared(key, fetch, settings.SHARED_CACHE_TTL, force=True)
+    if entry is None: return {}
+    install_ranks(league, entry[1]["data"], dict(entry[1]["aliases"]), datetime.fromtimestamp(_fetched_at(entry)))
+    return entry[1]["data"]
+
+async def _reload(league: str):
+    # LeagueStandingsV3 shares the stats.nba.com budget with game logs
+    if league == "NBA": return await NBA_API.run(_load_shared_ranks, league)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, _load_shared_ranks, league)
+
+def _schedule_refresh(league: str):
+    """Stale-while-revalidate: at most one background reload per league."""
+    task = RANK_REFRESH_TASKS.get(league)
+    if task is not None and not task.done(): return
+    RANK_REFRESH_TASKS[league] = asyncio.ensure_future(_reload(league))
+
+async def rank_refresh_loop():
+    while True:
+        for league in RANK_LOADERS:
+            await _reload(league)
+        await asyncio.sleep(RANK_TTL_SECONDS)
+
+@timed("rank.lookup")
 async def get_opponent_rank(league: str, opponent_name: str) -> str:
     """Returns '5th', '28th', or 'N/A'"""
     if not opponent_name or opponent_name == "TBD":
         return "N/A"
+    if league not in RANK_CACHE:
+        return "N/A"
         
-    ranks = {}
-    if league == "NBA":
-        ranks = get_nba_defense_ranks()
-    elif league == "NFL":
-        ranks = get_nfl_defense_ranks()
+    if not _is_fresh(league):
+        _schedule_refresh(league)
+    cached = RANK_CACHE[league]
+    aliases = cached["aliases"]
     
-    # Fuzzy Lookup
+    # 1. Exact Match on any alias (city, nickname, full name, abbreviation)
     opp_clean = opponent_name.lower().replace(".", "")
-    
-    # 1. Exact Match
-    if opp_clean in ranks:
-        r = ranks[opp_clean]
-        return f"{r}th"
+    record_cache("rank_alias", opp_clean in aliases)
+    if opp_clean in aliases:
+        r = aliases[opp_clean]
+        return f"{r}th" if r is not None else "N/A"
         
-    # 2. Partial Match (e.g. "Lakers" in "Los Angeles Lakers")
-    for team_key, rank_val in ranks.items():
+    # 2. Partial Match (e.g. "Lakers" in "Los Angeles Lakers"), remembered as an alias
+    r = None
+    for team_key, rank_val in cached["data"].items():
         if team_key in opp_clean or opp_clean in team_key:
-            return f"{rank_val}th"
-            
-    return "N/A"
\ No newline at end of file
+            r = rank_val
+            break
+    if cached["data"]: aliases[opp_clean] = r
+    return f"{r}th" if r is not None else "N/A"
\ No newline at end of file
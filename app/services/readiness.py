@@ -0,0 +1,22 @@
+from app.services.nfl_service import NFL_INDEX, INJURY_CACHE
+from app.services.nba_service import ROSTER_CACHE
+from app.services.rank_service import RANK_CACHE
+from app.services.schedule_service import SCHEDULE_SNAPSHOT
+from app.services.sgo_client import PLAYER_DB, LEAGUE_MAP
+
+# Datasets that must be warm before the instance reports ready
+REQUIRED = ("nfl_weekly", "nfl_injuries", "sgo_players_NBA")
+
+def get_readiness() -> dict:
+    leagues = sorted(set(LEAGUE_MAP.values()))
+    datasets = {
+        "nfl_weekly": 2024 in NFL_INDEX,
+        "nfl_injuries": INJURY_CACHE["status"] is not None,
+        "nba_roster_status": ROSTER_CACHE["snapshot"] is not None,
+    }
+    for league, cached in RANK_CACHE.items():
+        datasets[f"defense_ranks_{league}"] = cached["timestamp"] is not None
+    for league in leagues:
+        datasets[f"sgo_players_{league}"] = league in PLAYER_DB
+        datasets[f"schedule_{league}"] = league in SCHEDULE_SNAPSHOT
+    return {"ready": all(datasets[name] for name in REQUIRED), "datasets": datasets}
\ No newline at end of file
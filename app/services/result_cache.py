@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from app.config import settings
+
+class TTLCache:
+    """Bounded LRU map whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()  # Refresh hooks fire from executor threads
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or time.monotonic() - item[0] >= self.ttl:
+                if item is not None: del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def discard_where(self, predicate) -> int:
+        with self._lock:
+            stale = [k for k in self._data if predicate(k)]
+            for k in stale: del self._data[k]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> int:
+        return self.discard_where(lambda _: True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+# (player, sport, prop_type, line, operator) -> BetAnalysis
+RESULT_CACHE = TTLCache(settings.RESULT_CACHE_SIZE, settings.RESULT_CACHE_TTL)
+
+def invalidate_results(reason: str, player_name: Optional[str] = None):
+    """Drops cached analyses when the data behind them refreshes (all, or one player's legs)."""
+    if player_name is None:
+        dropped = RESULT_CACHE.clear()
+    else:
+        target = " ".join(player_name.lower().split())
+        dropped = RESULT_CACHE.discard_where(lambda k: target in k[0])
+    if dropped: print(f"Result cache: dropped {dropped} entries ({reason})")
\ No newline at end of file
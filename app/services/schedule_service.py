@@ -0,0 +1,74 @@
+import asyncio
+import httpx
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from app.config import settings
+from app.services.http_pool import sgo_get
+
+# league -> {"timestamp": datetime, "teams": {teamID: opponent name}}
+# Ranks are resolved at lookup (a RANK_CACHE dict hit), so a snapshot built before the
+# ranks load never pins "N/A" for a whole refresh interval.
+SCHEDULE_SNAPSHOT = {}
+
+def _team_name(team: dict) -> Optional[str]:
+    return team.get('name') or team.get('location')
+
+def _starts_at(event: dict) -> str:
+    status = event.get('status')
+    return str(status.get('startsAt') or "") if isinstance(status, dict) else ""
+
+async def fetch_upcoming_events(client: httpx.AsyncClient, league_id: str, max_pages: int = 10) -> Tuple[list, bool]:
+    """Scheduled events, plus whether paging ran to the last cursor (False on a non-200 or page cap)."""
+    events, cursor = [], None
+    for _ in range(max_pages):
+        params = {"leagueID": league_id, "status": "scheduled", "limit": 100}
+        if cursor: params["cursor"] = cursor
+        res = await sgo_get(client, "/events", params, "sgo.schedule")
+        if res.status_code != 200: return events, False
+        data = res.json()
+        batch = data.get('data', []) if isinstance(data, dict) else data
+        if not batch: return events, True
+        events.extend(e for e in batch if isinstance(e, dict))
+        cursor = data.get('nextCursor') if isinstance(data, dict) else None
+        if not cursor: return events, True
+    return events, False
+
+async def build_schedule_snapshot(client: httpx.AsyncClient, league_id: str) -> Optional[Dict[str, str]]:
+    """Maps every teamID to its next opponent; None when the schedule could not be read in full."""
+    events, complete = await fetch_upcoming_events(client, league_id)
+    if not complete: return None
+    # Events with no start time keep API order behind the dated ones
+    events.sort(key=lambda e: (_starts_at(e) == "", _starts_at(e)))
+
+    next_opponent = {}
+    for game in events:
+        home = game.get('teams', {}).get('home', {})
+        away = game.get('teams', {}).get('away', {})
+        if home.get('teamID'): next_opponent.setdefault(home['teamID'], _team_name(away))
+        if away.get('teamID'): next_opponent.setdefault(away['teamID'], _team_name(home))
+
+    return {team_id: opp_name or "TBD" for team_id, opp_name in next_opponent.items()}
+
+async def refresh_schedule(client: httpx.AsyncClient, league_id: str):
+    try:
+        teams = await build_schedule_snapshot(client, league_id)
+    except Exception as e:
+        print(f"Schedule Refresh Error ({league_id}): {e}")
+        return
+    if teams is None:
+        # Throttled or cut short: a partial map would report "TBD" for every missing team
+        print(f"Schedule Refresh Incomplete ({league_id}), keeping previous snapshot")
+        return
+    # Swap the whole league entry so readers never see a half-built map
+    SCHEDULE_SNAPSHOT[league_id] = {"timestamp": datetime.now(), "teams": teams}
+
+async def schedule_refresh_loop(client: httpx.AsyncClient, leagues: list):
+    while True:
+        await asyncio.gather(*(refresh_schedule(client, lg) for lg in leagues))
+        await asyncio.sleep(settings.SCHEDULE_REFRESH_SECONDS)
+
+def lookup_next_opponent(league_id: str, team_id: str) -> Optional[str]:
+    """None means the league has no snapshot yet; "TBD" means no game in a complete schedule."""
+    snapshot = SCHEDULE_SNAPSHOT.get(league_id)
+    if snapshot is None: return None
+    return snapshot["teams"].get(team_id, "TBD")
\ No newline at end of file
@@ -1,35 +1,60 @@
+import asyncio
+import concurrent.futures
 import json
 from duckduckgo_search import DDGS
 from openai import AsyncOpenAI
 from app.config import settings
-from app.services.nba_service import get_nba_real_stats 
-from app.services.nfl_service import get_nfl_real_stats
+from app.services.stats_access import get_nba_stats, get_nfl_stats
+from app.services import search_store
+from app.services.metrics import span, record_cache, register_executor
+from app.services.upstream import OPENAI, WEB_SEARCH, is_throttle_error
 
 client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
+# Result store I/O; DDGS itself runs on the WEB_SEARCH bulkhead's threads
+SEARCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=settings.WEB_SEARCH_WORKERS, thread_name_prefix="searchstore")
+register_executor("search_store", SEARCH_EXECUTOR)
+
+def _search_text(query: str) -> list:
+    # Using the new DDGS syntax
+    ddgs = DDGS()
+    return list(ddgs.text(query, max_results=4))
+
+def _clean_logs(raw) -> list:
+    logs = []
+    for v in raw if isinstance(raw, list) else []:
+        try: logs.append(float(v))
+        except (TypeError, ValueError): pass
+    return logs
+
 async def get_real_stats_via_web(player_name: str, sport: str, prop_type: str) -> dict:
     sport_lower = sport.lower()
     
     # 1. NBA ROUTE
     if "nba" in sport_lower or "basketball" in sport_lower:
-        nba_data = get_nba_real_stats(player_name, prop_type)
+        nba_data = await get_nba_stats(player_name, prop_type)
         if nba_data.get('logs'): return nba_data
 
     # 2. NFL ROUTE (NEW)
     if "nfl" in sport_lower or "football" in sport_lower:
-        nfl_data = get_nfl_real_stats(player_name, prop_type)
+        nfl_data = await get_nfl_stats(player_name, prop_type)
         if nfl_data.get('logs'): return nfl_data
             
     # 3. WEB SEARCH FALLBACK (MLB, NHL, etc.)
+    loop = asyncio.get_event_loop()
+    stored = await loop.run_in_executor(SEARCH_EXECUTOR, search_store.get_logs, player_name, sport, prop_type)
+    record_cache("web_search_store", bool(stored))
+    if stored: return {"logs": stored}
+
     print(f"SEARCHING WEB: {player_name} {sport} last 10 games {prop_type}...")
     
     query = f"{player_name} {sport} last 10 games game log stats {prop_type}"
     search_results = ""
     
     try:
-        # Using the new DDGS syntax
-        ddgs = DDGS()
-        results = list(ddgs.text(query, max_results=4))
+        with span("web.search"):
+            results = await WEB_SEARCH.run(_search_text, query, timeout=settings.WEB_SEARCH_TIMEOUT)
+        WEB_SEARCH.report(throttled=False)
         
         if not results:
             print("Web Search returned 0 results.")
@@ -38,8 +63,13 @@ async def get_real_stats_via_web(player_name: str, sport: str, prop_type: str) -
         for r in results:
             search_results += f"Source: {r['title']}\nContent: {r['body']}\n\n"
             
+    except asyncio.TimeoutError:
+        print(f"Web Search Timeout after {settings.WEB_SEARCH_TIMEOUT}s")
+        WEB_SEARCH.report(throttled=True)
+        return {}
     except Exception as e:
         print(f"Web Search Error: {e}")
+        if is_throttle_error(e): WEB_SEARCH.report(throttled=True)
         return {}
 
     system_prompt = """
@@ -53,17 +83,31 @@ async def get_real_stats_via_web(player_name: str, sport: str, prop_type: str) -
     """
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Player: {player_name}\nProp: {prop_type}\n\nWeb Data:\n{search_results}"}
-            ],
-            response_format={"type": "json_object"}
-        )
+        async with OPENAI.slot():
+            with span("web.llm"):
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model="gpt-4o",
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": f"Player: {player_name}\nProp: {prop_type}\n\nWeb Data:\n{search_results}"}
+                        ],
+                        response_format={"type": "json_object"}
+                    ),
+                    timeout=settings.WEB_SEARCH_LLM_TIMEOUT
+                )
+        OPENAI.report(throttled=False)
         data = json.loads(response.choices[0].message.content)
-        return data
+        logs = _clean_logs(data.get('logs'))
+        if not logs: return {}
+        await loop.run_in_executor(SEARCH_EXECUTOR, search_store.put_logs, player_name, sport, prop_type, logs)
+        return {"logs": logs}
 
+    except asyncio.TimeoutError:
+        print(f"LLM Parsing Timeout after {settings.WEB_SEARCH_LLM_TIMEOUT}s")
+        OPENAI.report(throttled=True)
+        return {}
     except Exception as e:
         print(f"LLM Parsing Failed: {e}")
+        if is_throttle_error(e): OPENAI.report(throttled=True)
         return {}
\ No newline at end of file
@@ -0,0 +1,52 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+from app.config import settings
+
+# Web-search fallback results survive restarts so repeat lookups skip DDGS and the LLM
+DB_PATH = os.path.join(settings.DATA_DIR, "search_results.sqlite3")
+_LOCAL = threading.local()
+
+def _connect() -> sqlite3.Connection:
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is None:
+        os.makedirs(settings.DATA_DIR, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            "player TEXT, sport TEXT, prop TEXT, logs TEXT, created REAL, "
+            "PRIMARY KEY (player, sport, prop))"
+        )
+        _LOCAL.conn = conn
+    return conn
+
+def _key(player_name: str, sport: str, prop_type: str) -> tuple:
+    return (" ".join(player_name.lower().replace(".", "").split()), sport.lower().strip(), prop_type.lower().strip())
+
+def get_logs(player_name: str, sport: str, prop_type: str) -> Optional[List[float]]:
+    try:
+        row = _connect().execute(
+            "SELECT logs, created FROM search_results WHERE player=? AND sport=? AND prop=?",
+            _key(player_name, sport, prop_type)
+        ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        # A broken store (e.g. unwritable DATA_DIR) is only a cache miss
+        print(f"Search Store Error: {e}")
+        return None
+    if row is None or time.time() - row[1] > settings.WEB_SEARCH_TTL: return None
+    return json.loads(row[0])
+
+def put_logs(player_name: str, sport: str, prop_type: str, logs: List[float]):
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO search_results (player, sport, prop, logs, created) VALUES (?, ?, ?, ?, ?)",
+            _key(player_name, sport, prop_type) + (json.dumps(logs), time.time())
+        )
+        conn.commit()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Search Store Error: {e}")
\ No newline at end of file
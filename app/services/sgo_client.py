@@ -2,16 +2,21 @@ import httpx
 import unicodedata
 import asyncio
 import random
+import time
 import concurrent.futures
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from app.config import settings
+from app.services.http_pool import get_sgo_client, sgo_get
+from app.services.metrics import record_cache, register_executor, run_in_context
+from app.services.result_cache import invalidate_results
+from app.services.shared_cache import load_shared_async
 from app.services.search_agent import get_real_stats_via_web
 from app.services.rank_service import get_opponent_rank
+from app.services.schedule_service import lookup_next_opponent
 from app.services.nfl_service import get_nfl_injury_status
 from app.services.nba_service import get_nba_status
+from app.services.feature_store import FEATURE_STORE, PlayerFeatures
 
-HEADERS = {"X-API-Key": settings.SGO_API_KEY}
 BASE_URL = settings.SGO_BASE_URL
 
 LEAGUE_MAP = {
@@ -20,6 +25,8 @@ LEAGUE_MAP = {
     "NHL": "NHL", "Hockey": "NHL",
     "MLB": "MLB", "Baseball": "MLB"
 }
+# Case-insensitive view: result keys lowercase the sport, so "nba" must resolve like "NBA"
+LEAGUE_BY_SPORT = {sport.lower(): league for sport, league in LEAGUE_MAP.items()}
 
 PROP_KEYWORDS = {
     "points": ["points", "pts", "score"],
@@ -31,79 +38,253 @@ PROP_KEYWORDS = {
 }
 
 PLAYER_DB = {}
-CACHE_LOCK = asyncio.Lock()
+PLAYER_INDEX = {}
+NGRAM_SIZE = 4
+# league_id -> in-flight first roster load (one per league, leagues never wait on each other)
+ROSTER_LOAD_TASKS = {}
+TEAM_EVENTS_CACHE = {}
+TEAM_EVENTS_INFLIGHT = {}
+# Local CPU work only; network-bound sources run in their own upstream bulkheads
 executor = concurrent.futures.ThreadPoolExecutor(max_workers=5)
+register_executor("local", executor)
 
 def normalize_name(name: str) -> str:
     nfkd_form = unicodedata.normalize('NFKD', name)
     plain_ascii = "".join([c for c in nfkd_form if not unicodedata.combining(c)])
     return plain_ascii.lower().replace(".", "").strip()
 
+def build_player_index(players: list) -> dict:
+    """Normalizes every roster name once so lookups never touch unicodedata."""
+    display_map, full_map, grams = {}, {}, {}
+    full_names = []
+    for i, p in enumerate(players):
+        names = p.get('names', {})
+        display = normalize_name(names.get('display', ''))
+        full = normalize_name(f"{names.get('firstName','')} {names.get('lastName','')}")
+        display_map.setdefault(display, i)
+        full_map.setdefault(full, i)
+        full_names.append(full)
+        # Any target of NGRAM_SIZE+ chars inside `full` shares all of its n-grams with it
+        for g in {full[j:j + NGRAM_SIZE] for j in range(len(full) - NGRAM_SIZE + 1)}:
+            grams.setdefault(g, []).append(i)
+    return {"players": players, "display": display_map, "full": full_map, "full_names": full_names, "grams": grams}
+
+async def page_league_players(client: httpx.AsyncClient, league_id: str) -> Tuple[list, bool]:
+    """All active players, plus whether paging ran to the last cursor (False on any error)."""
+    all_players = []
+    cursor = None
+    for _ in range(30):
+        params = {"leagueID": league_id, "active": "true", "limit": 100}
+        if cursor: params["cursor"] = cursor
+        try:
+            res = await sgo_get(client, "/players", params, "sgo.players")
+            if res.status_code != 200: return all_players, False
+            data = res.json()
+            batch = data.get('data', [])
+            if not batch: break
+            all_players.extend(batch)
+            cursor = data.get('nextCursor')
+            if not cursor: break
+        except: return all_players, False
+    return all_players, True
+
+def install_players(league_id: str, players: list, index: Optional[dict] = None):
+    # Both names are rebound in one synchronous step, readers never see a half-built roster
+    PLAYER_INDEX[league_id] = index or build_player_index(players)
+    PLAYER_DB[league_id] = players
+
+async def _load_league(client: httpx.AsyncClient, league_id: str):
+    async def page():
+        players, complete = await page_league_players(client, league_id)
+        return players if players and complete else None
+    # One worker pages the league, the others pick its roster up from the shared cache
+    entry = await load_shared_async(f"sgo_players:{league_id}", page, settings.SHARED_CACHE_TTL)
+    if entry is None:
+        # Nothing installed: the league stays cold, so the next request starts another load
+        print(f"Roster load ({league_id}): incomplete fetch, will retry")
+        return
+    players = entry[1]
+    # A background refresh may have landed first; keep the newer roster
+    if league_id not in PLAYER_DB:
+        install_players(league_id, players)
+        # Analyses computed during warm-up went to the simulated / web fallbacks
+        invalidate_results(f"{league_id} roster loaded")
+
+def ensure_league_loading(client: httpx.AsyncClient, league_id: str) -> Optional[asyncio.Future]:
+    """Starts a background roster load without making the caller wait for it (None if loaded)."""
+    if league_id in PLAYER_DB: return None
+    task = ROSTER_LOAD_TASKS.get(league_id)
+    if task is None or task.done():
+        task = ROSTER_LOAD_TASKS[league_id] = asyncio.ensure_future(_load_league(client, league_id))
+        task.add_done_callback(lambda _: ROSTER_LOAD_TASKS.pop(league_id, None))
+    return task
+
 async def fetch_all_players_once(client: httpx.AsyncClient, league_id: str):
-    if league_id in PLAYER_DB: return
-    async with CACHE_LOCK:
-        if league_id in PLAYER_DB: return
-        all_players = []
-        cursor = None
-        for _ in range(30):
-            params = {"leagueID": league_id, "active": "true", "limit": 100}
-            if cursor: params["cursor"] = cursor
-            try:
-                res = await client.get(f"{BASE_URL}/players", params=params)
-                if res.status_code != 200: break
-                data = res.json()
-                batch = data.get('data', [])
-                if not batch: break
-                all_players.extend(batch)
-                cursor = data.get('nextCursor')
-                if not cursor: break
-            except: break
-        PLAYER_DB[league_id] = all_players
+    """Single-flight per league: concurrent callers for one league share a single paging run."""
+    task = ensure_league_loading(client, league_id)
+    # Shield so one cancelled caller does not cancel the load for everyone waiting on it
+    if task is not None: await asyncio.shield(task)
+
+def diff_rosters(old: list, new: list) -> Dict[str, list]:
+    """playerIDs added / changed (team, names, status...) / removed between two roster pages."""
+    before = {p.get('playerID'): p for p in old if isinstance(p, dict)}
+    after = {p.get('playerID'): p for p in new if isinstance(p, dict)}
+    return {
+        "added": [pid for pid in after if pid not in before],
+        "changed": [pid for pid, p in after.items() if pid in before and before[pid] != p],
+        "removed": [pid for pid in before if pid not in after],
+    }
+
+def _prepare_roster(old: list, players: list) -> Tuple[dict, Dict[str, list]]:
+    return build_player_index(players), diff_rosters(old, players)
+
+async def reload_league_players(client: httpx.AsyncClient, league_id: str) -> Optional[Dict[str, int]]:
+    """
+    Re-pages a league's roster off to the side, indexes it in the executor and swaps it in.
+    A partial or empty page keeps the current roster. Returns added/changed/removed counts.
+    """
+    old = PLAYER_DB.get(league_id)
+    async def page():
+        players, complete = await page_league_players(client, league_id)
+        if not players or (old and not complete):
+            print(f"Roster refresh ({league_id}): incomplete fetch, keeping {len(old or [])} players")
+            return None
+        return players
+
+    # A roster another worker paged within the last half interval counts as this refresh
+    entry = await load_shared_async(f"sgo_players:{league_id}", page, settings.SHARED_CACHE_TTL, max_age=settings.PLAYER_REFRESH_SECONDS / 2)
+    if entry is None: return None
+    players = entry[1]
+    if players is old: return {"added": 0, "changed": 0, "removed": 0}
+
+    loop = asyncio.get_event_loop()
+    index, diff = await loop.run_in_executor(executor, run_in_context(_prepare_roster, old or [], players))
+    install_players(league_id, players, index)
+
+    counts = {k: len(v) for k, v in diff.items()}
+    print(f"Roster refresh ({league_id}): {counts['added']} added, {counts['changed']} changed, {counts['removed']} removed")
+    if old and (diff["changed"] or diff["removed"]):
+        _invalidate_players(old, diff["changed"] + diff["removed"], f"{league_id} roster refreshed")
+    return counts
+
+def _invalidate_players(roster: list, player_ids: list, reason: str):
+    """Drops cached analyses for the given playerIDs (by display name), or everything for a large batch."""
+    if not player_ids: return
+    if len(player_ids) > 50:
+        invalidate_results(reason)
+        return
+    wanted = set(player_ids)
+    for p in roster:
+        if isinstance(p, dict) and p.get('playerID') in wanted:
+            name = p.get('names', {}).get('display')
+            if name: invalidate_results(reason, name)
+
+async def player_refresh_loop(client: httpx.AsyncClient):
+    """Periodically re-pages every loaded league; cold leagues are left to ensure_league_loading."""
+    while True:
+        await asyncio.sleep(settings.PLAYER_REFRESH_SECONDS)
+        await asyncio.gather(*(reload_league_players(client, lg) for lg in list(PLAYER_DB)), return_exceptions=True)
 
 async def find_player_identity(league_id: str, name_query: str) -> Optional[dict]:
+    index = PLAYER_INDEX.get(league_id)
+    if index is None or index["players"] is not PLAYER_DB.get(league_id):
+        if league_id not in PLAYER_DB: return None
+        index = PLAYER_INDEX[league_id] = build_player_index(PLAYER_DB[league_id])
+
+    # Same rules as a front-to-back roster scan: the earliest player matching any rule wins
     target = normalize_name(name_query)
-    for p in PLAYER_DB.get(league_id, []):
-        names = p.get('names', {})
-        display = normalize_name(names.get('display', ''))
-        full = normalize_name(f"{names.get('firstName','')} {names.get('lastName','')}")
-        if target == display or target == full: return p
-        if len(target) > 3 and target in full: return p
-    return None
+    best = min(index["display"].get(target, len(index["players"])), index["full"].get(target, len(index["players"])))
+    if len(target) > 3:
+        grams = index["grams"]
+        candidates = min((grams.get(target[j:j + NGRAM_SIZE], []) for j in range(len(target) - NGRAM_SIZE + 1)), key=len)
+        full_names = index["full_names"]
+        for i in candidates:
+            if i >= best: break
+            if target in full_names[i]:
+                best = i
+                break
+    return index["players"][best] if best < len(index["players"]) else None
 
-async def fetch_real_game_logs(client: httpx.AsyncClient, league_id: str, team_id: str, player_id: str, prop_type: str) -> List[float]:
-    if not team_id: return []
-    keywords = PROP_KEYWORDS.get(prop_type.lower(), [prop_type.lower()])
-    logs = []
+def parse_team_events(events: list) -> Dict[str, list]:
+    """Groups scored player props by player, one row list per finalized event."""
+    by_player = {}
+    for event in events:
+        if not isinstance(event, dict): continue
+        event_rows = {}
+        for odd in event.get('odds', []):
+            if not isinstance(odd, dict): continue
+            pid = odd.get('playerID')
+            if not pid: continue
+            score_val = odd.get('score')
+            if score_val is None: continue
+            try: score = float(score_val)
+            except: continue
+            event_rows.setdefault(pid, []).append((str(odd.get('description') or '').lower(), str(odd.get('statID') or '').lower(), score))
+        for pid, rows in event_rows.items():
+            by_player.setdefault(pid, []).append(rows)
+    return by_player
+
+async def _load_team_events(client: httpx.AsyncClient, league_id: str, team_id: str) -> Optional[dict]:
+    params = {"leagueID": league_id, "teamID": team_id, "status": "finalized", "limit": 10, "includeProps": "true", "oddsAvailable": "false"}
     try:
-        params = {"leagueID": league_id, "teamID": team_id, "status": "finalized", "limit": 10, "includeProps": "true", "oddsAvailable": "false"}
-        res = await client.get(f"{BASE_URL}/events", params=params)
-        if res.status_code != 200: return []
+        res = await sgo_get(client, "/events", params, "sgo.events")
+        if res.status_code != 200: return None
         data_body = res.json()
         events = data_body.get('data', []) if isinstance(data_body, dict) else data_body
-        for event in events:
-            if not isinstance(event, dict): continue
-            odds = event.get('odds', [])
-            found = False
-            for odd in odds:
-                if not isinstance(odd, dict): continue
-                if odd.get('playerID') == player_id:
-                    desc = odd.get('description', '').lower()
-                    stat_id = odd.get('statID', '').lower()
-                    if any(k in desc for k in keywords) or any(k in stat_id for k in keywords):
-                        score_val = odd.get('score')
-                        if score_val is not None:
-                            try:
-                                logs.append(float(score_val))
-                                found = True
-                                break
-                            except: pass
-    except Exception: pass
-    return logs
+        entry = {"timestamp": time.monotonic(), "players": parse_team_events(events), "series": {}}
+    except Exception:
+        return None
+    old = TEAM_EVENTS_CACHE.get((league_id, team_id))
+    TEAM_EVENTS_CACHE[(league_id, team_id)] = entry
+    # Game logs are read from these events: drop analyses of players whose rows changed
+    # (every player with rows on the first load, their legs may have used a fallback)
+    before = old["players"] if old else {}
+    changed = [pid for pid in entry["players"].keys() | before.keys() if entry["players"].get(pid) != before.get(pid)]
+    _invalidate_players(PLAYER_DB.get(league_id) or [], changed, f"{league_id} team events refreshed")
+    return entry
+
+async def get_team_events(client: httpx.AsyncClient, league_id: str, team_id: str) -> Optional[dict]:
+    """Cached finalized events for a team; concurrent misses share one upstream call."""
+    key = (league_id, team_id)
+    entry = TEAM_EVENTS_CACHE.get(key)
+    if entry and time.monotonic() - entry["timestamp"] < settings.SGO_EVENTS_TTL:
+        record_cache("sgo_team_events", True)
+        return entry
+    record_cache("sgo_team_events", False)
+    task = TEAM_EVENTS_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_load_team_events(client, league_id, team_id))
+        TEAM_EVENTS_INFLIGHT[key] = task
+        task.add_done_callback(lambda _: TEAM_EVENTS_INFLIGHT.pop(key, None))
+    # Shield so one cancelled caller does not cancel the load for everyone waiting on it
+    return await asyncio.shield(task)
+
+async def fetch_real_game_logs(client: httpx.AsyncClient, league_id: str, team_id: str, player_id: str, prop_type: str) -> List[float]:
+    if not team_id: return []
+    entry = await get_team_events(client, league_id, team_id)
+    if entry is None: return []
+    prop_key = prop_type.lower()
+    series = entry["series"].get((player_id, prop_key))
+    if series is None:
+        keywords = PROP_KEYWORDS.get(prop_key, [prop_key])
+        series = []
+        for rows in entry["players"].get(player_id, []):
+            for desc, stat_id, score in rows:
+                if any(k in desc for k in keywords) or any(k in stat_id for k in keywords):
+                    series.append(score)
+                    break
+        entry["series"][(player_id, prop_key)] = series
+    return list(series)
 
 async def get_next_game_info(client: httpx.AsyncClient, league_id: str, team_id: str) -> Dict[str, str]:
+    opponent = lookup_next_opponent(league_id, team_id)
+    record_cache("schedule_snapshot", opponent is not None)
+    if opponent is not None:
+        return {"opponent": opponent, "rank": await get_opponent_rank(league_id, opponent)}
+    # Cold path until the background schedule snapshot lands
     try:
         params = {"leagueID": league_id, "teamID": team_id, "status": "scheduled", "limit": 1}
-        res = await client.get(f"{BASE_URL}/events", params=params)
+        res = await sgo_get(client, "/events", params, "sgo.next_game")
         if res.status_code != 200: return {"opponent": "TBD", "rank": "N/A"}
         data = res.json()
         events = data.get('data', []) if isinstance(data, dict) else data
@@ -121,56 +302,8 @@ async def get_next_game_info(client: httpx.AsyncClient, league_id: str, team_id:
         return {"opponent": "TBD", "rank": "N/A"}
 
 def calculate_advanced_real(logs: list, minutes: list, dates: list, venues: list) -> dict:
-    avg_minutes = "N/A"
-    if minutes:
-        clean_mins = []
-        for m in minutes:
-            try:
-                val = 0.0
-                if isinstance(m, str) and ":" in m:
-                    parts = m.split(":")
-                    val = float(parts[0]) + float(parts[1])/60
-                else: val = float(m)
-                if val > 0: clean_mins.append(val)
-            except: pass
-        if clean_mins:
-            recent = clean_mins[-5:]
-            real_avg = round(sum(recent) / len(recent), 1)
-            avg_minutes = f"{real_avg} min avg"
-
-    rest_str = "1 day rest"
-    if dates and len(dates) > 0:
-        try:
-            last_game_str = str(dates[-1])
-            last_date = None
-            for fmt in ["%b %d, %Y", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]:
-                try:
-                    last_date = datetime.strptime(last_game_str, fmt)
-                    break
-                except: pass
-            if last_date:
-                diff = (datetime.now() - last_date).days
-                if diff > 20: rest_str = "2 days rest"
-                else: rest_str = f"{diff} days rest"
-        except: pass
-
-    split_str = "0.0 (Neutral)"
-    if venues and logs and len(venues) == len(logs):
-        try:
-            home_vals = []
-            away_vals = []
-            for i, v in enumerate(logs):
-                loc = str(venues[i]).lower()
-                if "vs" in loc or "home" in loc: home_vals.append(v)
-                else: away_vals.append(v)
-            if home_vals and away_vals:
-                h_avg = sum(home_vals)/len(home_vals)
-                a_avg = sum(away_vals)/len(away_vals)
-                diff = round(h_avg - a_avg, 1)
-                split_str = f"{'+' if diff > 0 else ''}{diff} (Home vs Away)"
-        except: pass
-
-    return {"minutes": avg_minutes, "rest": rest_str, "split": split_str}
+    """Uncached one-off; the request path reads the same features from FEATURE_STORE."""
+    return PlayerFeatures(logs, minutes, dates, venues, fingerprint=0).advanced()
 
 def generate_market_data(player_name: str, line: float, operator: str) -> dict:
     """Generates realistic market signals (Price, Movement, Graph)."""
@@ -238,6 +371,7 @@ async def process_single_player(client, sub, league_id, sport, prop_type, prop_l
         p_logs = await fetch_real_game_logs(client, league_id, tid, pid, prop_type)
         if tid:
             game_info = await get_next_game_info(client, league_id, tid)
+            game_info["team_id"] = tid
 
     if not p_logs:
         web_data = await get_real_stats_via_web(sub, sport, prop_type)
@@ -252,98 +386,99 @@ async def process_single_player(client, sub, league_id, sport, prop_type, prop_l
     return p_logs, meta, game_info, sub
 
 async def get_player_data(player_name: str, sport: str, prop_line: float = 0.0, prop_type: str = "Points") -> Dict[str, Any]:
-    league_id = LEAGUE_MAP.get(sport, "NBA")
+    league_id = LEAGUE_BY_SPORT.get(sport.strip().lower(), "NBA")
     sub_names = [n.strip() for n in player_name.split('+')]
     
-    async with httpx.AsyncClient(headers=HEADERS, timeout=25.0) as client:
-        if league_id not in PLAYER_DB:
-            try: await fetch_all_players_once(client, league_id)
-            except: pass
-        
-        display_names, aggregated_logs = [], []
-        collected_metadata = {"minutes": [], "dates": [], "venues": []}
-        next_game_info = {"opponent": "TBD", "rank": "N/A"}
-        
-        tasks = [process_single_player(client, sub, league_id, sport, prop_type, prop_line) for sub in sub_names]
-        results = await asyncio.gather(*tasks)
-        
-        for i, res in enumerate(results):
-            p_logs, meta, game_info, name = res
-            if p_logs:
-                aggregated_logs.append(p_logs)
-                display_names.append(name)
-                if i == 0:
-                    collected_metadata = meta
-                    next_game_info = game_info
-            else:
-                aggregated_logs.append([0.0] * 10)
-                display_names.append(name)
+    client = get_sgo_client()
+    if league_id not in PLAYER_DB:
+        # Cold league: load it in the background, this request goes to the fallbacks
+        ensure_league_loading(client, league_id)
+    
+    display_names, aggregated_logs = [], []
+    collected_metadata = {"minutes": [], "dates": [], "venues": []}
+    next_game_info = {"opponent": "TBD", "rank": "N/A"}
+    
+    tasks = [process_single_player(client, sub, league_id, sport, prop_type, prop_line) for sub in sub_names]
+    results = await asyncio.gather(*tasks)
+    
+    for i, res in enumerate(results):
+        p_logs, meta, game_info, name = res
+        if p_logs:
+            aggregated_logs.append(p_logs)
+            display_names.append(name)
+            if i == 0:
+                collected_metadata = meta
+                next_game_info = game_info
+        else:
+            aggregated_logs.append([0.0] * 10)
+            display_names.append(name)
 
-        game_log = []
-        if aggregated_logs:
-            try:
-                for games in zip(*aggregated_logs): game_log.append(sum(games))
-            except: game_log = aggregated_logs[0]
-
-        is_simulated = False
-        if not game_log or sum(game_log) == 0:
-            is_simulated = True
-            if prop_line <= 0: prop_line = 20.5
-            seed_key = f"{player_name}_{prop_line}_{sport}"
-            rng = random.Random(seed_key)
-            game_log = []
-            for _ in range(10):
-                variance = rng.randint(-max(2, int(prop_line*0.25)), max(2, int(prop_line*0.25)))
-                game_log.append(max(0, int(prop_line + variance)))
-
-        season_avg = round(sum(game_log) / len(game_log), 1)
-        
-        loop = asyncio.get_event_loop()
-        task_calc = loop.run_in_executor(executor, calculate_advanced_real, game_log, collected_metadata['minutes'], collected_metadata['dates'], collected_metadata['venues'])
-        
-        primary_player = sub_names[0]
-        if sport == "NFL": task_injury = loop.run_in_executor(executor, get_nfl_injury_status, primary_player)
-        elif sport == "NBA": task_injury = loop.run_in_executor(executor, get_nba_status, primary_player)
-        else: task_injury = asyncio.sleep(0, result="Active")
-
-        real_stats, real_injury_status = await asyncio.gather(task_calc, task_injury)
-
-        usage_trend = "Stable"
-        if len(game_log) >= 5:
-            if sum(game_log[-5:])/5 > season_avg * 1.1: usage_trend = "Usage up 10%"
-            elif sum(game_log[-5:])/5 < season_avg * 0.9: usage_trend = "Usage down 10%"
-
-        rank = next_game_info['rank']
-        if rank == "N/A":
-            rank = f"{random.Random(f'{player_name}_rank').randint(1, 30)}th"
-        
+    game_log = []
+    if aggregated_logs:
         try:
-            r_num = int(''.join(filter(str.isdigit, rank)))
-            matchup = "Great" if r_num > 20 else ("Poor" if r_num < 10 else "Moderate")
-        except: matchup = "Moderate"
-
-        if is_simulated:
-            real_stats.update({"minutes": "30+ minutes", "rest": "1 day rest", "split": "0.0"})
-        if real_stats['minutes'] == "N/A": real_stats['minutes'] = "Rotation avg"
-
-        market_info = generate_market_data(player_name, prop_line, "Over")
-
-        return {
-            "found": True,
-            "name": " + ".join(display_names) if display_names else player_name,
-            "graph_data": game_log,
-            "season_avg": season_avg,
-            "advanced": {
-                "expected_minutes": real_stats['minutes'],
-                "avg_vs_opponent": season_avg, 
-                "usage_rate_change": usage_trend,
-                "matchup_difficulty": matchup,
-                "home_away_split": real_stats['split'],
-                "injury_status": real_injury_status,
-                "days_rest": real_stats['rest'],
-                "game_tempo": "Average",
-                "opponent_defense_rank": rank,
-                "line_movement": "Stable"
-            },
-            "market": market_info
-        }
\ No newline at end of file
+            for games in zip(*aggregated_logs): game_log.append(sum(games))
+        except: game_log = aggregated_logs[0]
+
+    is_simulated = False
+    if not game_log or sum(game_log) == 0:
+        is_simulated = True
+        if prop_line <= 0: prop_line = 20.5
+        seed_key = f"{player_name}_{prop_line}_{sport}"
+        rng = random.Random(seed_key)
+        game_log = []
+        for _ in range(10):
+            variance = rng.randint(-max(2, int(prop_line*0.25)), max(2, int(prop_line*0.25)))
+            game_log.append(max(0, int(prop_line + variance)))
+
+    # Rolling features are derived once per game-log window, then reused until the log changes
+    features = FEATURE_STORE.ingest(
+        (sport, " ".join(player_name.lower().split()), prop_type.lower()),
+        game_log, collected_metadata['minutes'], collected_metadata['dates'], collected_metadata['venues']
+    )
+    season_avg = features.season_avg
+    real_stats = features.advanced()
+    usage_trend = features.usage_trend
+    
+    loop = asyncio.get_event_loop()
+    primary_player = sub_names[0]
+    if sport == "NFL": real_injury_status = await loop.run_in_executor(executor, run_in_context(get_nfl_injury_status, primary_player))
+    elif sport == "NBA": real_injury_status = await loop.run_in_executor(executor, run_in_context(get_nba_status, primary_player))
+    else: real_injury_status = "Active"
+
+    rank = next_game_info['rank']
+    if rank == "N/A":
+        rank = f"{random.Random(f'{player_name}_rank').randint(1, 30)}th"
+    
+    try:
+        r_num = int(''.join(filter(str.isdigit, rank)))
+        matchup = "Great" if r_num > 20 else ("Poor" if r_num < 10 else "Moderate")
+    except: matchup = "Moderate"
+
+    if is_simulated:
+        real_stats.update({"minutes": "30+ minutes", "rest": "1 day rest", "split": "0.0"})
+    if real_stats['minutes'] == "N/A": real_stats['minutes'] = "Rotation avg"
+
+    market_info = generate_market_data(player_name, prop_line, "Over")
+
+    return {
+        "found": True,
+        "name": " + ".join(display_names) if display_names else player_name,
+        "team_id": results[0][2].get("team_id") if results else None,
+        "is_simulated": is_simulated,
+        "graph_data": game_log,
+        "season_avg": season_avg,
+        "last_5_avg": features.last_5_avg,
+        "advanced": {
+            "expected_minutes": real_stats['minutes'],
+            "avg_vs_opponent": season_avg, 
+            "usage_rate_change": usage_trend,
+            "matchup_difficulty": matchup,
+            "home_away_split": real_stats['split'],
+            "injury_status": real_injury_status,
+            "days_rest": real_stats['rest'],
+            "game_tempo": "Average",
+            "opponent_defense_rank": rank,
+            "line_movement": "Stable"
+        },
+        "market": market_info
+    }
\ No newline at end of file
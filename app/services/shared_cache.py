@@ -0,0 +1,212 @@
+import asyncio
+import concurrent.futures
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from app.config import settings
+from app.services.metrics import record_cache, register_executor, run_in_context
+
+# Warm datasets (SGO rosters, NFL frames, injury report, defense ranks) shared between
+# uvicorn workers. Entries are (created, value) with a TTL; a per-key lease makes one
+# worker fetch while the others wait for its result instead of downloading it again
+# (leases are per process: in-process callers keep their own single-flight).
+#
+#   SHARED_CACHE_URL=""                      in-process only (single worker, the default)
+#   SHARED_CACHE_URL="sqlite"                DATA_DIR/shared_cache.sqlite3
+#   SHARED_CACHE_URL="sqlite:///path.db"     explicit SQLite file
+#   SHARED_CACHE_URL="redis://host:6379/0"   Redis (needs the `redis` package)
+
+Entry = Tuple[float, Any]  # (created epoch seconds, value)
+
+class MemoryBackend:
+    """Process-local dict; values are stored as-is (no serialization)."""
+    name = "memory"
+
+    def __init__(self):
+        self._data = {}
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None: return None
+            if item[0] <= time.time():
+                del self._data[key]
+                return None
+            return item[1]
+
+    def set(self, key: str, entry: Entry, ttl: float):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, entry)
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        with self._lock:
+            held = self._leases.get(key)
+            if held and held[1] > time.time() and held[0] != owner: return False
+            self._leases[key] = (owner, time.time() + ttl)
+            return True
+
+    def release(self, key: str, owner: str):
+        with self._lock:
+            if self._leases.get(key, (None,))[0] == owner: del self._leases[key]
+
+class SQLiteBackend:
+    """One local file shared by every worker on the host; values are pickled."""
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT, expires REAL)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Entry]:
+        row = self._connect().execute("SELECT value, expires FROM entries WHERE key=?", (key,)).fetchone()
+        if row is None or row[1] <= time.time(): return None
+        return pickle.loads(row[0])
+
+    def set(self, key: str, entry: Entry, ttl: float):
+        blob = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        self._connect().execute("INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)", (key, blob, time.time() + ttl))
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM leases WHERE key=? AND expires<=?", (key, now))
+            conn.execute("INSERT OR IGNORE INTO leases (key, owner, expires) VALUES (?, ?, ?)", (key, owner, now + ttl))
+            won = conn.execute("SELECT owner FROM leases WHERE key=?", (key,)).fetchone()[0] == owner
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return won
+
+    def release(self, key: str, owner: str):
+        self._connect().execute("DELETE FROM leases WHERE key=? AND owner=?", (key, owner))
+
+class RedisBackend:
+    """Any Redis-protocol server; leases are SET NX PX with an owner token."""
+    name = "redis"
+    _RELEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+    def __init__(self, url: str):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Entry]:
+        blob = self._redis.get(f"parlai:{key}")
+        return pickle.loads(blob) if blob is not None else None
+
+    def set(self, key: str, entry: Entry, ttl: float):
+        self._redis.set(f"parlai:{key}", pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL), px=int(ttl * 1000))
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        return bool(self._redis.set(f"parlai:lease:{key}", owner, nx=True, px=int(ttl * 1000)))
+
+    def release(self, key: str, owner: str):
+        self._redis.eval(self._RELEASE, 1, f"parlai:lease:{key}", owner)
+
+def make_backend(url: str):
+    if not url or url == "memory": return MemoryBackend()
+    if url == "sqlite": return SQLiteBackend(os.path.join(settings.DATA_DIR, "shared_cache.sqlite3"))
+    if url.startswith("sqlite:///"): return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            return RedisBackend(url)
+        except ImportError:
+            print("Shared cache: `redis` is not installed, falling back to in-process cache")
+            return MemoryBackend()
+    raise ValueError(f"Unsupported SHARED_CACHE_URL: {url}")
+
+SHARED_CACHE = make_backend(settings.SHARED_CACHE_URL)
+# Identifies this worker's leases
+OWNER = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+# Backend I/O (pickling multi-MB frames, SQLite/Redis round trips) stays off the event loop
+SHARED_CACHE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="shared-cache")
+register_executor("shared_cache", SHARED_CACHE_EXECUTOR)
+
+def _safe(op, *args, default=None):
+    # A broken backend degrades to "every worker loads for itself", never to an error
+    try:
+        return op(*args)
+    except Exception as e:
+        print(f"Shared Cache Error ({SHARED_CACHE.name}): {e}")
+        return default
+
+def _usable(entry: Optional[Entry], newer_than: float) -> bool:
+    return entry is not None and entry[0] >= newer_than
+
+def _cutoff(max_age: Optional[float], force: bool, started: float) -> float:
+    # force: only a value produced after this call started counts (e.g. another worker's refresh)
+    if force: return started
+    return started - max_age if max_age is not None else float("-inf")
+
+def load_shared(key: str, loader: Callable[[], Any], ttl: float, max_age: Optional[float] = None, force: bool = False) -> Optional[Entry]:
+    """
+    Blocking single-flight load across workers. Returns (created, value) from the shared
+    cache when it is new enough, otherwise whichever worker wins the lease runs `loader`
+    and publishes its result. A loader returning None publishes nothing (returns None).
+    """
+    started = time.time()
+    newer_than = _cutoff(max_age, force, started)
+    deadline = started + settings.SHARED_CACHE_LEASE_SECONDS
+    while True:
+        entry = _safe(SHARED_CACHE.get, key)
+        if _usable(entry, newer_than):
+            record_cache("shared_cache", True)
+            return entry
+        if _safe(SHARED_CACHE.acquire, key, OWNER, settings.SHARED_CACHE_LEASE_SECONDS, default=True) or time.time() > deadline:
+            record_cache("shared_cache", False)
+            try:
+                value = loader()
+                if value is None: return None
+                entry = (time.time(), value)
+                _safe(SHARED_CACHE.set, key, entry, ttl)
+                return entry
+            finally:
+                _safe(SHARED_CACHE.release, key, OWNER)
+        time.sleep(settings.SHARED_CACHE_POLL_SECONDS)
+
+async def load_shared_async(key: str, loader: Callable[[], Awaitable[Any]], ttl: float, max_age: Optional[float] = None, force: bool = False) -> Optional[Entry]:
+    """load_shared for coroutine loaders; backend calls run in SHARED_CACHE_EXECUTOR."""
+    loop = asyncio.get_event_loop()
+    def call(op, *args, default=None):
+        return loop.run_in_executor(SHARED_CACHE_EXECUTOR, run_in_context(functools.partial(_safe, default=default), op, *args))
+
+    started = time.time()
+    newer_than = _cutoff(max_age, force, started)
+    deadline = started + settings.SHARED_CACHE_LEASE_SECONDS
+    while True:
+        entry = await call(SHARED_CACHE.get, key)
+        if _usable(entry, newer_than):
+            record_cache("shared_cache", True)
+            return entry
+        won = await call(SHARED_CACHE.acquire, key, OWNER, settings.SHARED_CACHE_LEASE_SECONDS, default=True)
+        if won or time.time() > deadline:
+            record_cache("shared_cache", False)
+            try:
+                value = await loader()
+                if value is None: return None
+                entry = (time.time(), value)
+                await call(SHARED_CACHE.set, key, entry, ttl)
+                return entry
+            finally:
+                await call(SHARED_CACHE.release, key, OWNER)
+        await asyncio.sleep(settings.SHARED_CACHE_POLL_SECONDS)
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import httpx
+from datetime import datetime
+from typing import TYPE_CHECKING
+from app.config import settings
+from app.services.nfl_service import NFL_CACHE, INJURY_CACHE, load_weekly_data, load_injury_data, preload_nfl_data
+from app.services.sgo_client import PLAYER_DB, install_players, reload_league_players
+from app.services.rank_service import RANK_CACHE, install_ranks
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Warm caches on local disk: Parquet for the NFL frames, JSON for rosters and ranks
+SNAPSHOT_DIR = os.path.join(settings.DATA_DIR, "snapshot")
+MANIFEST = "manifest.json"
+
+def _path(name: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, name)
+
+def _tmp_path(name: str) -> str:
+    # Every worker saves at shutdown: per-process temp names keep concurrent writers apart
+    return _path(f"{name}.{os.getpid()}.tmp")
+
+def _write_json(name: str, payload):
+    tmp = _tmp_path(name)
+    with open(tmp, "w") as f: json.dump(payload, f)
+    os.replace(tmp, _path(name))
+
+def _write_parquet(name: str, df: "pd.DataFrame | pa.Table"):
+    tmp = _tmp_path(name)
+    if hasattr(df, "to_parquet"): df.to_parquet(tmp, index=False)
+    else:
+        # Attached (memory-mapped Arrow) frames are written straight from the mapping
+        import pyarrow.parquet as pq
+        pq.write_table(df, tmp)
+    os.replace(tmp, _path(name))
+
+def save_snapshot():
+    """Writes every warm cache to SNAPSHOT_DIR; each file is replaced atomically."""
+    if not NFL_CACHE and not PLAYER_DB:
+        return # Nothing warm yet, keep the previous snapshot
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    manifest = {"saved_at": datetime.now().isoformat(), "nfl_weekly": [], "injuries": None}
+    try:
+        for year, df in list(NFL_CACHE.items()):
+            _write_parquet(f"nfl_weekly_{year}.parquet", df)
+            manifest["nfl_weekly"].append(year)
+        if INJURY_CACHE["data"] is not None:
+            _write_parquet("nfl_injuries.parquet", INJURY_CACHE["data"])
+            manifest["injuries"] = INJURY_CACHE["timestamp"].isoformat()
+        _write_json("players.json", dict(PLAYER_DB))
+        _write_json("ranks.json", {
+            league: {"timestamp": c["timestamp"].isoformat(), "data": c["data"], "aliases": c["aliases"]}
+            for league, c in RANK_CACHE.items() if c["timestamp"]
+        })
+        _write_json(MANIFEST, manifest)
+        print(f"Snapshot saved to {SNAPSHOT_DIR}")
+    except Exception as e:
+        print(f"Snapshot Save Error: {e}")
+
+def load_snapshot() -> dict:
+    """Installs a recent snapshot into the live caches. Returns what was restored."""
+    restored = {"nfl": False, "leagues": []}
+    try:
+        with open(_path(MANIFEST)) as f: manifest = json.load(f)
+        age = (datetime.now() - datetime.fromisoformat(manifest["saved_at"])).total_seconds()
+        if age > settings.SNAPSHOT_MAX_AGE:
+            print("Snapshot too old, starting cold.")
+            return restored
+    except (OSError, ValueError, KeyError):
+        return restored
+
+    # Each section restores on its own, so one unreadable file does not skip the rest
+    def restore(section: str, step):
+        try:
+            return step()
+        except Exception as e:
+            print(f"Snapshot Load Warning ({section}): {e}")
+            return False
+
+    def nfl_weekly():
+        import pandas as pd
+        # Published once for every worker: a worker starting after another maps its files
+        # instead of parsing the Parquet snapshot again
+        for year in manifest["nfl_weekly"]:
+            load_weekly_data(year, lambda: pd.read_parquet(_path(f"nfl_weekly_{year}.parquet")))
+        return bool(manifest["nfl_weekly"])
+
+    def injuries():
+        import pandas as pd
+        if not manifest["injuries"]: return False
+        load_injury_data(lambda: (pd.read_parquet(_path("nfl_injuries.parquet")), datetime.fromisoformat(manifest["injuries"])))
+        return True
+
+    def players():
+        with open(_path("players.json")) as f:
+            for league_id, league_players in json.load(f).items():
+                install_players(league_id, league_players)
+                restored["leagues"].append(league_id)
+
+    def ranks():
+        with open(_path("ranks.json")) as f:
+            for league, c in json.load(f).items():
+                install_ranks(league, c["data"], c["aliases"], datetime.fromisoformat(c["timestamp"]))
+
+    weekly_ok = restore("nfl weekly", nfl_weekly)
+    injuries_ok = restore("injuries", injuries)
+    restored["nfl"] = bool(weekly_ok and injuries_ok)
+    restore("players", players)
+    restore("ranks", ranks)
+
+    print(f"Snapshot restored (NFL: {restored['nfl']}, rosters: {restored['leagues']})")
+    return restored
+
+async def revalidate_warm_state(client: httpx.AsyncClient, restored: dict):
+    """Refreshes whatever came from disk, then writes a new snapshot."""
+    loop = asyncio.get_event_loop()
+    if restored["nfl"]:
+        await loop.run_in_executor(None, preload_nfl_data, True)
+    await asyncio.gather(*(reload_league_players(client, lg) for lg in restored["leagues"]))
+    await loop.run_in_executor(None, save_snapshot)
\ No newline at end of file
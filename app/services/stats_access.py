@@ -0,0 +1,60 @@
+import asyncio
+import concurrent.futures
+from app.config import settings
+from app.services.nba_service import fetch_nba_game_log, nba_logs_for_prop
+from app.services.nfl_service import get_nfl_real_stats
+from app.services.result_cache import TTLCache, invalidate_results
+from app.services.metrics import span, record_cache, register_executor, run_in_context
+from app.services.upstream import NBA_API, is_throttle_error
+
+# Local pandas lookups; stats.nba.com calls go through the NBA_API bulkhead instead
+STATS_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=settings.STATS_WORKERS, thread_name_prefix="stats")
+register_executor("stats", STATS_EXECUTOR)
+
+# normalized player name -> game log ({} for a player nba_api does not know); names come
+# from screenshots, so the map is bounded and entries expire after NBA_LOG_TTL
+NBA_LOG_CACHE = TTLCache(settings.NBA_LOG_CACHE_SIZE, settings.NBA_LOG_TTL)
+NBA_LOG_INFLIGHT = {}
+
+def _player_key(player_name: str) -> str:
+    return " ".join(player_name.lower().replace(".", "").split())
+
+async def _run_blocking(func, *args):
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(STATS_EXECUTOR, run_in_context(func, *args))
+
+async def _load_nba_game_log(key: str, player_name: str):
+    try:
+        game_log = await NBA_API.run(fetch_nba_game_log, player_name)
+    except Exception as e:
+        print(f"NBA API Failed: {e}")
+        # Back off on 429s/timeouts only; failed calls are not cached so the next request can retry
+        if is_throttle_error(e): NBA_API.report(throttled=True)
+        return {}
+    NBA_API.report(throttled=False)
+    NBA_LOG_CACHE.set(key, game_log)
+    # Cached analyses of this player predate the log (or used a fallback without one)
+    invalidate_results("NBA game log refreshed", player_name)
+    return game_log
+
+async def get_nba_game_log(player_name: str) -> dict:
+    """One nba_api fetch per player per TTL, shared by every prop type and concurrent caller."""
+    key = _player_key(player_name)
+    game_log = NBA_LOG_CACHE.get(key)
+    if game_log is not None:
+        record_cache("nba_game_log", True)
+        return game_log
+    record_cache("nba_game_log", False)
+    task = NBA_LOG_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_load_nba_game_log(key, player_name))
+        NBA_LOG_INFLIGHT[key] = task
+        task.add_done_callback(lambda _: NBA_LOG_INFLIGHT.pop(key, None))
+    return await asyncio.shield(task)
+
+async def get_nba_stats(player_name: str, prop_type: str) -> dict:
+    with span("stats.nba"):
+        return nba_logs_for_prop(await get_nba_game_log(player_name), prop_type)
+
+async def get_nfl_stats(player_name: str, prop_type: str) -> dict:
+    return await _run_blocking(get_nfl_real_stats, player_name, prop_type)
\ No newline at end of file
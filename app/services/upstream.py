@@ -0,0 +1,126 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import time
+from typing import Optional
+from app.config import settings
+from app.services.metrics import Counter, Histogram, register_metric, register_gauge, register_executor, run_in_context
+
+QUEUE_WAIT_SECONDS = register_metric(Histogram("parlai_upstream_queue_wait_seconds", "Time spent waiting for an upstream slot."))
+THROTTLED = register_metric(Counter("parlai_upstream_throttled_total", "429/timeout responses that triggered backoff."))
+
+class Upstream:
+    """
+    Bulkhead for one dependency: a token bucket caps the request rate, a
+    semaphore caps concurrent calls, and 429s/timeouts halve the rate and
+    pause new calls (recovering additively on success).
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_in_flight: int, workers: int = 0):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.waiting = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff = 0.0
+        self._gate = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # Blocking clients get their own threads so they cannot exhaust a shared pool
+        self.executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        if workers:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            register_executor(name, self.executor)
+
+    async def _take_token(self):
+        async with self._gate:  # FIFO: one waiter refills and sleeps at a time
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def _acquire(self):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                self._slots.release()
+                raise
+        finally:
+            self.waiting -= 1
+        QUEUE_WAIT_SECONDS.observe(time.perf_counter() - start, upstream=self.name)
+        self.in_flight += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        await self._acquire()
+        try:
+            yield self
+        finally:
+            self._release()
+
+    def report(self, throttled: bool):
+        """Feed back each call's outcome: multiplicative decrease, additive increase."""
+        if throttled:
+            THROTTLED.inc(upstream=self.name)
+            self.rate = max(self.max_rate * 0.1, self.rate / 2)
+            self._backoff = min(30.0, self._backoff * 2 if self._backoff else 1.0)
+            self._paused_until = time.monotonic() + self._backoff
+            print(f"Upstream {self.name} throttled: rate {self.rate:.2f}/s, pausing {self._backoff:.0f}s")
+        elif self.rate < self.max_rate or self._backoff:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+            self._backoff = 0.0
+
+    async def run(self, func, *args, timeout: Optional[float] = None):
+        """Runs a blocking call on this upstream's threads, inside a slot (timeout excludes queue wait)."""
+        await self._acquire()
+        try:
+            future = asyncio.get_event_loop().run_in_executor(self.executor, run_in_context(func, *args))
+        except BaseException:
+            self._release()
+            raise
+        # A timed-out call still occupies its thread, so its slot is only freed when the thread
+        # finishes; otherwise later calls would queue inside the executor on their own timeout
+        future.add_done_callback(self._call_finished)
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def _call_finished(self, future: asyncio.Future):
+        self._release()
+        # Retrieve the outcome so an abandoned (timed-out) call does not log "never retrieved"
+        if not future.cancelled(): future.exception()
+
+def is_throttle_error(exc: BaseException) -> bool:
+    # Matched by name so callers need not import each client library's exception types
+    name = type(exc).__name__.lower()
+    return "ratelimit" in name or "timeout" in name or "429" in str(exc)
+
+SGO = Upstream("sgo", settings.SGO_RATE, settings.SGO_BURST, settings.SGO_MAX_IN_FLIGHT)
+NBA_API = Upstream("nba_api", settings.NBA_API_RATE, settings.NBA_API_BURST, settings.NBA_API_MAX_IN_FLIGHT, workers=settings.NBA_API_MAX_IN_FLIGHT)
+OPENAI = Upstream("openai", settings.OPENAI_RATE, settings.OPENAI_BURST, settings.OPENAI_MAX_IN_FLIGHT)
+WEB_SEARCH = Upstream("web_search", settings.WEB_SEARCH_RATE, settings.WEB_SEARCH_BURST, settings.WEB_SEARCH_MAX_IN_FLIGHT, workers=settings.WEB_SEARCH_MAX_IN_FLIGHT)
+UPSTREAMS = {u.name: u for u in (SGO, NBA_API, OPENAI, WEB_SEARCH)}
+
+register_gauge("parlai_upstream_in_flight", "Calls currently running per upstream.",
+               lambda: {(("upstream", n),): float(u.in_flight) for n, u in UPSTREAMS.items()})
+register_gauge("parlai_upstream_waiting", "Calls queued for a slot per upstream.",
+               lambda: {(("upstream", n),): float(u.waiting) for n, u in UPSTREAMS.items()})
+register_gauge("parlai_upstream_rate", "Current adaptive request rate per upstream (req/s).",
+               lambda: {(("upstream", n),): u.rate for n, u in UPSTREAMS.items()})
\ No newline at end of file
@@ -1,9 +1,13 @@
+import asyncio
 import base64
 import json
 import re
 from openai import AsyncOpenAI
 from app.config import settings
 from app.schemas import ExtractedBet
+from app.services.image_prep import prepare_image
+from app.services.metrics import span
+from app.services.upstream import OPENAI, is_throttle_error
 
 client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
@@ -14,7 +18,11 @@ def clean_json_string(json_str: str) -> str:
     return json_str
 
 async def extract_bets_from_image(image_bytes: bytes) -> list[ExtractedBet]:
-    base64_image = base64.b64encode(image_bytes).decode('utf-8')
+    # Crop, downscale and re-encode off the event loop before upload
+    loop = asyncio.get_event_loop()
+    with span("vision.prep"):
+        image_data, mime_type, detail = await loop.run_in_executor(None, prepare_image, image_bytes)
+    base64_image = base64.b64encode(image_data).decode('utf-8')
 
     system_prompt = """
     You are a sports betting data extractor.
@@ -42,20 +50,23 @@ async def extract_bets_from_image(image_bytes: bytes) -> list[ExtractedBet]:
     """
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user", 
-                    "content": [
-                        {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}}
-                    ]
-                }
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.0 
-        )
+        async with OPENAI.slot():
+            with span("vision.llm"):
+                response = await client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {
+                            "role": "user", 
+                            "content": [
+                                {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{base64_image}", "detail": detail}}
+                            ]
+                        }
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.0 
+                )
+        OPENAI.report(throttled=False)
 
         raw_content = response.choices[0].message.content
         cleaned_content = clean_json_string(raw_content)
@@ -81,5 +92,6 @@ async def extract_bets_from_image(image_bytes: bytes) -> list[ExtractedBet]:
         return extracted
 
     except Exception as e:
+        if is_throttle_error(e): OPENAI.report(throttled=True)
         print(f"Vision Service Error: {e}")
         return []
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Offline microbenchmarks for the analysis hot paths.
+
+    python -m benchmarks.bench_hot_paths [--rounds 7] [--filter nfl] [--json out.json]
+
+Every data source is a seeded synthetic fixture, so numbers are comparable
+across commits on the same machine. Reports best/median time per call and
+the tracemalloc peak for one round.
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks import fixtures
+
+# search_agent / vision build their OpenAI clients at import time; no request is ever sent
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+BENCHMARKS = []
+
+def benchmark(name: str, number: int):
+    def register(setup):
+        BENCHMARKS.append((name, number, setup))
+        return setup
+    return register
+
+def _runner(fn, number: int):
+    """Returns a zero-arg callable that performs `number` calls of fn (sync or async)."""
+    if asyncio.iscoroutinefunction(fn):
+        loop = asyncio.new_event_loop()
+        async def abatch():
+            for _ in range(number): await fn()
+        return lambda: loop.run_until_complete(abatch())
+    def batch():
+        for _ in range(number): fn()
+    return batch
+
+def measure(fn, number: int, rounds: int) -> dict:
+    run = _runner(fn, number)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run()  # warm-up (first-use imports, memo tables)
+        timings = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                start = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - start) / number)
+        finally:
+            if gc_was_enabled: gc.enable()
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "ops": number,
+        "best_us": round(min(timings) * 1e6, 3),
+        "median_us": round(statistics.median(timings) * 1e6, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+# --- SGO player resolution -------------------------------------------------
+
+@benchmark("find_player_identity (650 players)", number=2000)
+def bench_find_player():
+    from app.services import sgo_client
+    players = fixtures.make_player_db(650)
+    sgo_client.install_players("NBA", players)
+    queries = fixtures.player_queries(players)
+    state = {"i": 0}
+    async def op():
+        state["i"] = (state["i"] + 1) % len(queries)
+        await sgo_client.find_player_identity("NBA", queries[state["i"]])
+    return op
+
+@benchmark("calculate_advanced_real", number=2000)
+def bench_advanced():
+    from app.services.sgo_client import calculate_advanced_real
+    ctx = fixtures.make_game_context()
+    return lambda: calculate_advanced_real(ctx["logs"], ctx["minutes"], ctx["dates"], ctx["venues"])
+
+@benchmark("generate_market_data", number=5000)
+def bench_market():
+    from app.services.sgo_client import generate_market_data
+    return lambda: generate_market_data("LeBron James", 24.5, "Over")
+
+# --- NFL pandas-backed lookups ---------------------------------------------
+
+def _install_nfl():
+    from app.services import nfl_service
+    nfl_service.install_weekly_data(2024, fixtures.make_nfl_weekly())
+    nfl_service.install_injury_data(fixtures.make_nfl_injuries(), __import__("datetime").datetime.now())
+    return nfl_service
+
+@benchmark("get_nfl_real_stats (memoized name)", number=2000)
+def bench_nfl_stats_warm():
+    nfl_service = _install_nfl()
+    return lambda: nfl_service.get_nfl_real_stats("Jalen Brunson 42", "Rush+Rec Yds")
+
+@benchmark("get_nfl_real_stats (cold name)", number=300)
+def bench_nfl_stats_cold():
+    nfl_service = _install_nfl()
+    def op():
+        nfl_service.NFL_INDEX[2024]["matches"].clear()
+        nfl_service.get_nfl_real_stats("Jalen Brunson 42", "Fantasy Score")
+    return op
+
+@benchmark("get_nfl_injury_status (memoized name)", number=5000)
+def bench_injury_warm():
+    nfl_service = _install_nfl()
+    return lambda: nfl_service.get_nfl_injury_status("Kyrie Fox 77")
+
+@benchmark("get_nfl_injury_status (cold name)", number=300)
+def bench_injury_cold():
+    nfl_service = _install_nfl()
+    def op():
+        nfl_service.INJURY_CACHE["status"]["matches"].clear()
+        nfl_service.get_nfl_injury_status("Kyrie Fox 77")
+    return op
+
+# --- Scoring and parlay aggregation ----------------------------------------
+
+def _stub_player_data():
+    from app.services import analyzer
+    async def fake_get_player_data(player_name, sport, prop_line=0.0, prop_type="Points"):
+        return fixtures.make_player_data(player_name, prop_line)
+    analyzer.get_player_data = fake_get_player_data
+    return analyzer
+
+@benchmark("analyze_single_bet (stubbed data, uncached)", number=1000)
+def bench_analyze_uncached():
+    analyzer = _stub_player_data()
+    from app.schemas import ExtractedBet
+    bet = ExtractedBet(player_name="LeBron James", sport="NBA", prop_type="Points", line=24.5, operator="Over")
+    async def op():
+        analyzer.RESULT_CACHE.clear()
+        await analyzer.analyze_single_bet(bet)
+    return op
+
+@benchmark("analyze_single_bet (result cache hit)", number=5000)
+def bench_analyze_cached():
+    analyzer = _stub_player_data()
+    from app.schemas import ExtractedBet
+    bet = ExtractedBet(player_name="LeBron James", sport="NBA", prop_type="Points", line=24.5, operator="Over")
+    async def op():
+        await analyzer.analyze_single_bet(bet)
+    return op
+
+@benchmark("summarize_parlay (6 legs)", number=5000)
+def bench_parlay():
+    analyzer = _stub_player_data()
+    from app.api.routes import summarize_parlay
+    from app.schemas import ExtractedBet
+    bets = [ExtractedBet(player_name=f"Player {i}", line=10.5 + i) for i in range(6)]
+    legs = [analyzer.build_bet_analysis(b, fixtures.make_player_data(b.player_name, b.line)) for b in bets]
+    return lambda: summarize_parlay(legs)
+
+@benchmark("simulate_parlay (6 correlated legs, 100k samples)", number=50)
+def bench_simulate():
+    analyzer = _stub_player_data()
+    from app.api.routes import simulation_legs
+    from app.services.parlay_engine import simulate_parlay
+    from app.schemas import ExtractedBet
+    bets = [ExtractedBet(player_name=f"Player {i // 2}", line=10.5 + i, operator="Over" if i % 3 else "Under") for i in range(6)]
+    analyzed = [analyzer.build_bet_analysis(b, fixtures.make_player_data(b.player_name, b.line)) for b in bets]
+    legs = simulation_legs(analyzed, bets)
+    return lambda: simulate_parlay(legs, samples=100_000)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{'benchmark':48} {'ops':>6} {'best us':>10} {'median us':>10} {'peak KiB':>9}")
+    for name, number, setup in BENCHMARKS:
+        if args.filter.lower() not in name.lower(): continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn = setup()
+        r = measure(fn, number, args.rounds)
+        results[name] = r
+        print(f"{name:48} {r['ops']:>6} {r['best_us']:>10.3f} {r['median_us']:>10.3f} {r['peak_kib']:>9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "rounds": args.rounds, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Synthetic, seeded fixtures sized like real production data (no network)."""
+import random
+
+FIRST = ["LeBron", "Luka", "Kyrie", "José", "Ja", "Jalen", "Jaylen", "De'Aaron", "Nikola", "Giannis",
+         "Shai", "Anthony", "Stephen", "Kevin", "Devin", "Donovan", "Tyrese", "Jayson", "Zion", "Paolo",
+         "Victor", "Tyler", "Cade", "Scottie", "Evan", "Jaren", "Trae", "Dejounte", "Bam", "Domantas"]
+LAST = ["James", "Dončić", "Irving", "Alvarado", "Morant", "Brunson", "Brown", "Fox", "Jokić", "Antetokounmpo",
+        "Gilgeous-Alexander", "Davis", "Curry", "Durant", "Booker", "Mitchell", "Haliburton", "Tatum", "Williamson",
+        "Banchero", "Wembanyama", "Herro", "Cunningham", "Barnes", "Mobley", "Jackson Jr.", "Young", "Murray",
+        "Adebayo", "Sabonis"]
+
+def make_player_db(n: int = 650, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    pairs = [(f, l) for f in FIRST for l in LAST]
+    rng.shuffle(pairs)
+    players = []
+    for i, (first, last) in enumerate(pairs[:n]):
+        players.append({
+            "playerID": f"{first}_{last}_{i}".upper().replace(" ", "_"),
+            "teamID": f"TEAM_{i % 30}",
+            "names": {"firstName": first, "lastName": last, "display": f"{first} {last}" if i % 4 else ""},
+        })
+    return players
+
+def player_queries(players: list, seed: int = 11) -> list:
+    """Mix of exact display/full names, partial last names and misses."""
+    rng = random.Random(seed)
+    queries = []
+    for p in rng.sample(players, 40):
+        names = p["names"]
+        queries.append(f"{names['firstName']} {names['lastName']}")
+        queries.append(names["lastName"])
+    queries += ["Unknown Rookie", "Zzyzx Player", "Jr", "Mike"]
+    return queries
+
+def make_game_context(seed: int = 3) -> dict:
+    rng = random.Random(seed)
+    return {
+        "logs": [float(rng.randint(10, 40)) for _ in range(10)],
+        "minutes": [f"{rng.randint(24, 40)}:{rng.randint(0, 59):02d}" for _ in range(10)],
+        "dates": [f"Jan {d:02d}, 2025" for d in range(1, 21, 2)],
+        "venues": ["Home" if rng.random() < 0.5 else "Away" for _ in range(10)],
+    }
+
+def make_nfl_weekly(players: int = 330, weeks: int = 18, seed: int = 5):
+    import pandas as pd
+    rng = random.Random(seed)
+    rows = []
+    for p in range(players):
+        name = f"{FIRST[p % len(FIRST)]} {LAST[(p * 7) % len(LAST)]} {p}"
+        for week in range(1, weeks + 1):
+            rows.append({
+                "player_display_name": name,
+                "week": week,
+                "location": "Home" if (week + p) % 2 else "Away",
+                "targets": rng.randint(0, 12),
+                "rushing_yards": float(rng.randint(0, 120)),
+                "receiving_yards": float(rng.randint(0, 140)),
+                "rushing_tds": rng.randint(0, 2),
+                "receiving_tds": rng.randint(0, 2),
+                "receptions": rng.randint(0, 10),
+            })
+    return pd.DataFrame(rows)
+
+def make_nfl_injuries(players: int = 330, weeks: int = 18, seed: int = 9):
+    import pandas as pd
+    rng = random.Random(seed)
+    statuses = ["Questionable", "Out", "Doubtful", None]
+    rows = []
+    for p in range(players):
+        name = f"{FIRST[p % len(FIRST)]} {LAST[(p * 7) % len(LAST)]} {p}"
+        for week in range(1, weeks + 1):
+            if rng.random() < 0.35:
+                rows.append({"full_name": name, "week": week, "report_status": rng.choice(statuses)})
+    return pd.DataFrame(rows)
+
+def make_player_data(player_name: str, line: float, seed: int = 1) -> dict:
+    """Shape of get_player_data's return value, for stubbing analyze_single_bet."""
+    rng = random.Random(f"{player_name}_{line}_{seed}")
+    logs = [float(max(0, line + rng.randint(-8, 8))) for _ in range(10)]
+    return {
+        "found": True,
+        "name": player_name,
+        "graph_data": logs,
+        "season_avg": round(sum(logs) / len(logs), 1),
+        "advanced": {
+            "expected_minutes": "34.2 min avg", "avg_vs_opponent": round(sum(logs) / len(logs), 1),
+            "usage_rate_change": "Stable", "matchup_difficulty": rng.choice(["Great", "Moderate", "Poor"]),
+            "home_away_split": "+1.2 (Home vs Away)", "injury_status": rng.choice(["Active", "Questionable"]),
+            "days_rest": "1 days rest", "game_tempo": "Average", "opponent_defense_rank": f"{rng.randint(1, 30)}th",
+            "line_movement": "Stable",
+        },
+        "market": {
+            "best_line": f"Over {line} (-110)", "best_book_logo": "FanDuel", "market_disagreement": "Low",
+            "books_range": f"{line}", "open_vs_current": f"Opened at {line}", "movement_badge": "Stable Market",
+            "movement_graph": [line] * 5, "vegas_edge": "Good Price", "market_pressure": "Vegas holding steady",
+            "hit_rate": f"Over {line} hits 52% historically",
+        },
+    }